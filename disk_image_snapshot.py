@@ -6,6 +6,8 @@
 
 import os
 import platform
+import queue
+import struct
 import time
 import shutil
 import tempfile
@@ -21,9 +23,17 @@ except ImportError:
     WIN32_AVAILABLE = False
     print("警告: pywin32未安装，某些功能可能受限")
 
+# DeviceIoControl控制码：获取磁盘/卷的字节长度
+IOCTL_DISK_GET_LENGTH_INFO = 0x0007405C
+
 class DiskImageSnapshot:
     """磁盘镜像快照管理类"""
     
+    # 复制数据块大小
+    CHUNK_SIZE = 1024 * 1024
+    # 读线程最多领先写入的数据块数量
+    PIPELINE_DEPTH = 32
+    
     def __init__(self, progress_callback: Optional[Callable] = None):
         """
         初始化磁盘镜像快照管理器
@@ -37,6 +47,7 @@ class DiskImageSnapshot:
         self.temp_dir = None
         self.is_creating = False
         self._stop_event = threading.Event()
+        self._disk_size_cache = {}  # 规范化设备路径 -> 磁盘大小
         
     def _emit_progress(self, current: int, total: int, message: str = ""):
         """发送进度更新"""
@@ -44,12 +55,53 @@ class DiskImageSnapshot:
             self.progress_callback(current, total, message)
     
     def get_disk_size(self, disk_path: str = None) -> int:
-        """获取磁盘大小（公共方法）"""
+        """获取磁盘大小（公共方法，结果按规范化设备路径缓存）"""
         if disk_path is None:
             disk_path = self.source_disk
         if disk_path is None:
             return 0
-        return self._get_disk_size(disk_path)
+        
+        device_path = self._normalize_device_path(disk_path)
+        if device_path in self._disk_size_cache:
+            return self._disk_size_cache[device_path]
+        
+        size = 0
+        if platform.system() == 'Windows' and WIN32_AVAILABLE and device_path.startswith('\\\\.\\'):
+            size = self._get_device_length(device_path)
+        if size <= 0:
+            size = self._get_disk_size(disk_path)
+        
+        if size > 0:
+            self._disk_size_cache[device_path] = size
+        return size
+    
+    def _normalize_device_path(self, disk_path: str) -> str:
+        """将驱动器路径规范化为设备路径，如 'g:'、'G:\\' -> '\\\\.\\G:'"""
+        if self._is_drive_path(disk_path) and len(disk_path.rstrip('\\/')) == 2:
+            return f'\\\\.\\{disk_path[0].upper()}:'
+        return disk_path
+    
+    def _get_device_length(self, device_path: str) -> int:
+        """通过IOCTL_DISK_GET_LENGTH_INFO直接获取设备长度"""
+        handle = None
+        try:
+            handle = win32file.CreateFile(
+                device_path,
+                win32file.GENERIC_READ,
+                win32file.FILE_SHARE_READ | win32file.FILE_SHARE_WRITE,
+                None,
+                win32file.OPEN_EXISTING,
+                0,
+                None
+            )
+            length_info = win32file.DeviceIoControl(handle, IOCTL_DISK_GET_LENGTH_INFO, None, 8)
+            return struct.unpack('<q', length_info)[0]
+        except Exception as e:
+            print(f"通过IOCTL获取设备 {device_path} 长度失败: {e}")
+            return 0
+        finally:
+            if handle is not None:
+                win32file.CloseHandle(handle)
     
     def _get_disk_size(self, disk_path: str) -> int:
         """获取磁盘大小（私有方法）"""
@@ -289,70 +341,30 @@ class DiskImageSnapshot:
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
             # 开始复制
-            chunk_size = 64 * 1024  # 64KB chunks for better progress monitoring
-            copied_size = 0
+            chunk_size = self.CHUNK_SIZE
             
-            print(f"开始数据复制，chunk大小: {chunk_size} 字节")
+            print(f"开始数据复制，chunk大小: {chunk_size} 字节，流水线深度: {self.PIPELINE_DEPTH}")
             self._emit_progress(0, total_size, "正在创建磁盘镜像...")
             
             try:
                 if platform.system() == 'Windows' and WIN32_AVAILABLE:
                     # Windows系统使用win32file
+                    def read_chunk(read_size):
+                        try:
+                            _, data = win32file.ReadFile(source_handle, read_size)
+                            return data
+                        except Exception as e:
+                            if "到达文件结尾" in str(e) or "EOF" in str(e):
+                                return b''
+                            raise
+                    
                     with open(output_path, 'wb') as output_file:
-                        read_count = 0
-                        while copied_size < total_size and not self._stop_event.is_set():
-                            # 计算本次读取大小
-                            read_size = min(chunk_size, total_size - copied_size)
-                            
-                            # 读取数据
-                            try:
-                                _, data = win32file.ReadFile(source_handle, read_size)
-                                read_count += 1
-                                
-                                if not data:
-                                    print(f"读取到空数据，已读取 {read_count} 次，复制了 {copied_size} 字节")
-                                    break
-                                    
-                                # 写入数据
-                                output_file.write(data)
-                                copied_size += len(data)
-                                
-                                # 每1000次读取输出一次调试信息
-                                if read_count % 1000 == 0:
-                                    print(f"已读取 {read_count} 次，复制了 {copied_size:,} 字节，数据块大小: {len(data)} 字节")
-                                
-                                # 更新进度
-                                progress_percent = (copied_size / total_size) * 100
-                                self._emit_progress(
-                                    copied_size, 
-                                    total_size, 
-                                    f"已复制: {copied_size / (1024*1024*1024):.2f} GB ({progress_percent:.1f}%)"
-                                )
-                                
-                            except Exception as e:
-                                if "到达文件结尾" in str(e) or "EOF" in str(e):
-                                    break
-                                else:
-                                    raise
+                        copied_size = self._pipelined_copy(read_chunk, output_file, total_size)
                 else:
                     # Linux/Unix系统
                     with open(source_disk, 'rb') as source_file:
                         with open(output_path, 'wb') as output_file:
-                            while copied_size < total_size and not self._stop_event.is_set():
-                                data = source_file.read(chunk_size)
-                                if not data:
-                                    break
-                                    
-                                output_file.write(data)
-                                copied_size += len(data)
-                                
-                                # 更新进度
-                                progress_percent = (copied_size / total_size) * 100
-                                self._emit_progress(
-                                    copied_size, 
-                                    total_size, 
-                                    f"已复制: {copied_size / (1024*1024*1024):.2f} GB ({progress_percent:.1f}%)"
-                                )
+                            copied_size = self._pipelined_copy(source_file.read, output_file, total_size)
                 
             finally:
                 # 关闭句柄
@@ -397,6 +409,83 @@ class DiskImageSnapshot:
             
         return result
     
+    def _pipelined_copy(self, read_chunk, output_file, total_size: int) -> int:
+        """
+        流水线复制：后台线程读取源磁盘，当前线程写入镜像文件，读写互相重叠
+        
+        Args:
+            read_chunk: 读取函数，接收读取大小，返回数据（空数据表示结束）
+            output_file: 已打开的输出文件
+            total_size: 需要复制的总字节数
+            
+        Returns:
+            int: 实际复制的字节数
+        """
+        chunks = queue.Queue(maxsize=self.PIPELINE_DEPTH)
+        abort = threading.Event()
+        
+        def put(item):
+            # 写入端出错时不再阻塞读线程
+            while not abort.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def reader():
+            remaining = total_size
+            try:
+                while remaining > 0 and not self._stop_event.is_set():
+                    data = read_chunk(min(self.CHUNK_SIZE, remaining))
+                    if not data:
+                        break
+                    remaining -= len(data)
+                    if not put(data):
+                        return
+            except Exception as e:
+                put(e)
+            finally:
+                put(None)
+        
+        reader_thread = threading.Thread(target=reader, daemon=True)
+        reader_thread.start()
+        
+        copied_size = 0
+        read_count = 0
+        try:
+            while True:
+                data = chunks.get()
+                if data is None:
+                    break
+                if isinstance(data, Exception):
+                    raise data
+                
+                output_file.write(data)
+                copied_size += len(data)
+                read_count += 1
+                
+                # 每1000次读取输出一次调试信息
+                if read_count % 1000 == 0:
+                    print(f"已读取 {read_count} 次，复制了 {copied_size:,} 字节，数据块大小: {len(data)} 字节")
+                
+                # 更新进度
+                progress_percent = (copied_size / total_size) * 100
+                self._emit_progress(
+                    copied_size, 
+                    total_size, 
+                    f"已复制: {copied_size / (1024*1024*1024):.2f} GB ({progress_percent:.1f}%)"
+                )
+        finally:
+            abort.set()
+            reader_thread.join()
+        
+        if copied_size < total_size and not self._stop_event.is_set():
+            print(f"读取到空数据，已读取 {read_count} 次，复制了 {copied_size} 字节")
+        
+        return copied_size
+    
     def stop_creation(self):
         """停止镜像创建"""
         self._stop_event.set()
@@ -16,7 +16,7 @@ from PyQt5.QtGui import QIcon
 
 from ui_components import (
     FileSystemTree, HexViewer, DiskInfoPanel, StatusBar,
-    ProgressDialog, WorkerThread, DataWipeDialog
+    ProgressDialog, WorkerThread, DataWipeDialog, install_button_styles
 )
 from disk_utils import DiskManager
 from file_recovery import FileRecovery
@@ -3211,6 +3211,7 @@ class DiskRecoveryTool(QMainWindow):
 
 def main():
     app = QApplication(sys.argv)
+    install_button_styles(app)  # 对话框按钮样式只在启动时解析一次
     window = DiskRecoveryTool()
     window.show()
     sys.exit(app.exec_())
@@ -1,11 +1,19 @@
 import os
 import sys
+import mmap
 import struct
+from contextlib import contextmanager
 from PyQt5.QtCore import QObject, pyqtSignal
 
+# MBR分区表项（16字节）: 引导标志、起始CHS、分区类型、结束CHS、起始LBA、扇区数
+MBR_ENTRY = struct.Struct('<B3sB3sII')
+
 class DiskManager(QObject):
     """磁盘管理器"""
     
+    # 批量读取时，跨度不超过该扇区数的相邻请求合并为一次连续读取（2MB）
+    COALESCE_SECTORS = 4096
+    
     def __init__(self):
         super().__init__()
     
@@ -205,29 +213,11 @@ class DiskManager(QObject):
                         info['header_preview'] = header[:64].hex()
                         
                         # 检查MBR签名
-                        if len(header) >= 512 and header[510:512] == b'\x55\xaa':
+                        if len(header) >= 512 and header[510] == 0x55 and header[511] == 0xAA:
                             info['mbr_signature'] = 'Valid (0x55AA)'
                             
                             # 解析分区表
-                            partitions = []
-                            for i in range(4):
-                                offset = 446 + i * 16
-                                if offset + 16 <= len(header):
-                                    partition_data = header[offset:offset + 16]
-                                    if partition_data[4] != 0:  # 分区类型不为0
-                                        start_lba = struct.unpack('<L', partition_data[8:12])[0]
-                                        sectors = struct.unpack('<L', partition_data[12:16])[0]
-                                        partition = {
-                                            'index': i + 1,
-                                            'status': 'Active' if partition_data[0] == 0x80 else 'Inactive',
-                                            'type': partition_data[4],
-                                            'type_name': self._get_partition_type_name(partition_data[4]),
-                                            'start_lba': start_lba,
-                                            'start_sector': start_lba,  # 添加兼容性字段
-                                            'sectors': sectors
-                                        }
-                                        partition['size_human'] = self._format_size(partition['sectors'] * 512)
-                                        partitions.append(partition)
+                            partitions = list(self.iter_mbr_partitions(header))
                             
                             if partitions:
                                 info['partitions'] = partitions
@@ -255,6 +245,26 @@ class DiskManager(QObject):
         
         return info
     
+    def iter_mbr_partitions(self, mbr_data):
+        """逐个解析MBR分区表项，生成非空分区的信息字典"""
+        for i in range(4):
+            # 一次解码整个分区表项
+            boot_flag, _, partition_type, _, start_lba, sectors = \
+                MBR_ENTRY.unpack_from(mbr_data, 446 + i * 16)
+            if partition_type == 0:  # 空分区表项
+                continue
+            
+            yield {
+                'index': i + 1,
+                'status': 'Active' if boot_flag == 0x80 else 'Inactive',
+                'type': partition_type,
+                'type_name': self._get_partition_type_name(partition_type),
+                'start_lba': start_lba,
+                'start_sector': start_lba,  # 添加兼容性字段
+                'sectors': sectors,
+                'size_human': self._format_size(sectors * 512)
+            }
+    
     def _get_drive_size(self, drive):
         """获取驱动器大小（Windows）"""
         try:
@@ -523,6 +533,127 @@ class DiskManager(QObject):
         except Exception as e:
             raise Exception(f'读取扇区失败: {str(e)}')
     
+    @contextmanager
+    def _open_sector_reader(self, disk_path):
+        """打开磁盘用于读取，产出 read_into(start_sector, view) -> 读取的字节数"""
+        device_path = None
+        if sys.platform == 'win32':
+            if len(disk_path) == 3 and disk_path[1:] == ':\\':
+                # 逻辑驱动器，转换为设备路径
+                device_path = f'\\\\.\\{disk_path[0].upper()}:'
+            elif disk_path.startswith('\\\\.\\'):
+                device_path = disk_path
+        
+        if device_path:
+            import win32file
+            handle = win32file.CreateFile(
+                device_path,
+                win32file.GENERIC_READ,
+                win32file.FILE_SHARE_READ | win32file.FILE_SHARE_WRITE,
+                None,
+                win32file.OPEN_EXISTING,
+                win32file.FILE_FLAG_SEQUENTIAL_SCAN,
+                None
+            )
+            if handle == win32file.INVALID_HANDLE_VALUE:
+                raise Exception(f'无法打开磁盘设备: {device_path}')
+            
+            def read_into(start_sector, view):
+                win32file.SetFilePointer(handle, start_sector * 512, win32file.FILE_BEGIN)
+                _, data = win32file.ReadFile(handle, len(view))
+                view[:len(data)] = data
+                return len(data)
+            
+            try:
+                yield read_into
+            finally:
+                win32file.CloseHandle(handle)
+        else:
+            # 文件（虚拟磁盘）或Linux设备，直接读入调用方的缓冲区
+            with open(disk_path, 'rb', buffering=0) as f:
+                if hasattr(os, 'posix_fadvise'):
+                    # 提示内核顺序预读
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                
+                def read_into(start_sector, view):
+                    f.seek(start_sector * 512)
+                    total = 0
+                    while total < len(view):
+                        count = f.readinto(view[total:])
+                        if not count:
+                            break
+                        total += count
+                    return total
+                
+                yield read_into
+    
+    def read_sectors_into(self, disk_path, start_sector, sector_count, out):
+        """读取磁盘扇区到调用方提供的缓冲区（可重复使用），返回读取的字节数"""
+        try:
+            view = memoryview(out)[:sector_count * 512]
+            with self._open_sector_reader(disk_path) as read_into:
+                return read_into(start_sector, view)
+        except Exception as e:
+            raise Exception(f'读取扇区失败: {str(e)}')
+    
+    def read_sectors_batch(self, disk_path, requests):
+        """批量读取磁盘扇区，只打开一次磁盘
+        
+        requests: [(start_sector, sector_count), ...]
+        返回与requests顺序对应的memoryview列表，相邻的请求合并为一次读取，
+        所有数据共用一个预先分配的缓冲区
+        """
+        # 依次合并相邻请求: [起始扇区, 结束扇区, [请求序号...]]
+        runs = []
+        for i, (start_sector, sector_count) in enumerate(requests):
+            end_sector = start_sector + sector_count
+            if runs and runs[-1][0] <= start_sector and end_sector - runs[-1][0] <= self.COALESCE_SECTORS:
+                run = runs[-1]
+                run[1] = max(run[1], end_sector)
+                run[2].append(i)
+            else:
+                runs.append([start_sector, end_sector, [i]])
+        
+        results = [None] * len(requests)
+        buffer = memoryview(bytearray(sum(run[1] - run[0] for run in runs) * 512))
+        
+        try:
+            with self._open_sector_reader(disk_path) as read_into:
+                position = 0
+                for run_start, run_end, indexes in runs:
+                    run_size = (run_end - run_start) * 512
+                    data = buffer[position:position + read_into(run_start, buffer[position:position + run_size])]
+                    position += run_size
+                    
+                    # 从合并读取的数据中切出各个请求的扇区
+                    for i in indexes:
+                        offset = (requests[i][0] - run_start) * 512
+                        results[i] = data[offset:offset + requests[i][1] * 512]
+        except Exception as e:
+            raise Exception(f'读取扇区失败: {str(e)}')
+        
+        return results
+    
+    def map_region(self, disk_path, offset, length):
+        """以只读内存映射方式访问磁盘区域，返回该区域的memoryview
+        
+        不复制数据，所有视图释放后映射自动解除。超出磁盘末尾的部分会被截断。
+        Windows原始设备不支持映射，会抛出OSError，调用方应回退到read_sectors。
+        """
+        aligned_offset = offset - offset % mmap.ALLOCATIONGRANULARITY
+        fd = os.open(disk_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            disk_size = os.lseek(fd, 0, os.SEEK_END)
+            length = min(length, disk_size - offset)
+            if length <= 0:
+                raise ValueError(f'映射区域超出磁盘范围: offset={offset}')
+            region = mmap.mmap(fd, offset - aligned_offset + length,
+                               access=mmap.ACCESS_READ, offset=aligned_offset)
+        finally:
+            os.close(fd)
+        
+        return memoryview(region)[offset - aligned_offset:]
+    
     def write_sectors(self, disk_path, start_sector, data):
         """写入磁盘扇区"""
         try:
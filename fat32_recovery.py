@@ -11,6 +11,15 @@ except ImportError:
     DISK_IMAGE_AVAILABLE = False
     print("警告: 磁盘镜像快照功能不可用")
 
+# 8.3短文件名字节 -> 字符的转换表：可打印且合法的ASCII字符保持原样，
+# Windows文件名非法字符和非ASCII字节用十六进制表示
+_SFN_EXT_CHARS = tuple(
+    chr(b) if 32 <= b <= 126 and chr(b) not in '<>:"/\\|?*' else f"_{b:02X}_"
+    for b in range(256)
+)
+# 文件名部分中0x05是0xE5的替代
+_SFN_NAME_CHARS = _SFN_EXT_CHARS[:0x05] + (chr(0xE5),) + _SFN_EXT_CHARS[0x06:]
+
 class FAT32Recovery(QObject):
     """FAT32文件系统恢复类"""
     
@@ -1598,35 +1607,9 @@ class FAT32Recovery(QObject):
         name_bytes = dir_entry[0:8]
         ext_bytes = dir_entry[8:11]
         
-        # 处理文件名
-        name = ""
-        for b in name_bytes:
-            if b == 0x20:  # 空格填充
-                break
-            if b == 0x05:  # 特殊字符0xE5的替代
-                name += chr(0xE5)
-            elif 32 <= b <= 126:  # 可打印ASCII字符
-                # 过滤Windows文件名中的非法字符
-                if chr(b) not in '<>:"/\\|?*':
-                    name += chr(b)
-                else:
-                    name += f"_{b:02X}_"
-            else:
-                name += f"_{b:02X}_"  # 非ASCII字符用十六进制表示
-        
-        # 处理扩展名
-        ext = ""
-        for b in ext_bytes:
-            if b == 0x20:  # 空格填充
-                break
-            if 32 <= b <= 126:  # 可打印ASCII字符
-                # 过滤Windows文件名中的非法字符
-                if chr(b) not in '<>:"/\\|?*':
-                    ext += chr(b)
-                else:
-                    ext += f"_{b:02X}_"
-            else:
-                ext += f"_{b:02X}_"  # 非ASCII字符用十六进制表示
+        # 处理文件名和扩展名：截到第一个空格填充，整段查表转换
+        name = "".join(map(_SFN_NAME_CHARS.__getitem__, name_bytes.partition(b' ')[0]))
+        ext = "".join(map(_SFN_EXT_CHARS.__getitem__, ext_bytes.partition(b' ')[0]))
         
         if not name:
             return None
@@ -3,13 +3,130 @@
 
 import os
 import platform
+import queue
 import datetime
 import struct
 import time
+import threading
 import traceback
 from disk_reader import DiskReader
 from disk_image_snapshot import DiskImageSnapshot, create_disk_image_snapshot
 
+# 引导扇区标识，预先转换为整数，用unpack_from直接比较而不切片
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+_FAT32_MAGIC = _U64.unpack(b'FAT32   ')[0]  # 偏移0x52
+_NTFS_MAGIC = _U32.unpack(b'NTFS')[0]  # 偏移0x03
+_BOOT_SIGNATURE = 0xAA55  # 偏移0x1FE，55 AA
+
+# 引导扇区BPB开头部分: 跳转指令、OEM名称、每扇区字节数、每簇扇区数（FAT32与NTFS相同）
+_BPB = struct.Struct('<3s8sHB')
+
+def _boot_sector_type(sector):
+    """识别引导扇区类型，返回 'FAT32'、'NTFS'、'MBR' 或 None"""
+    view = memoryview(sector)
+    if _U64.unpack_from(view, 0x52)[0] == _FAT32_MAGIC:
+        return 'FAT32'
+    if _U32.unpack_from(view, 3)[0] == _NTFS_MAGIC:
+        return 'NTFS'
+    if _U16.unpack_from(view, 0x1FE)[0] == _BOOT_SIGNATURE:
+        return 'MBR'
+    return None
+
+# 本进程中已创建过的目录，避免为每个文件重复调用makedirs
+_made_dirs = set()
+
+def _ensure_dir(dir_path):
+    """确保目录存在，同一目录只创建一次"""
+    if dir_path and dir_path not in _made_dirs:
+        os.makedirs(dir_path, exist_ok=True)
+        _made_dirs.add(dir_path)
+
+class FileWriter:
+    """恢复文件写入器：每个文件写完立即关闭，依赖系统写回缓存，由一个后台线程分批同步到磁盘"""
+    
+    # 累积多少个待同步文件后交给同步线程
+    SYNC_BATCH = 64
+    
+    def __init__(self):
+        self._pending = []  # 已写入并关闭、待同步的文件路径
+        self._sync_queue = None
+        self._sync_thread = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def write(self, file_path, data):
+        """写入一个文件并关闭，不立即同步"""
+        dir_path = os.path.dirname(file_path)
+        _ensure_dir(dir_path)
+    
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        try:
+            fd = os.open(file_path, flags, 0o644)
+        except FileNotFoundError:
+            # 目录在缓存后被删除，重新创建
+            _made_dirs.discard(dir_path)
+            _ensure_dir(dir_path)
+            fd = os.open(file_path, flags, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+    
+        self._pending.append(file_path)
+        if len(self._pending) >= self.SYNC_BATCH:
+            self._submit_sync()
+    
+    def _submit_sync(self):
+        """把当前批次交给同步线程，首次使用时启动该线程"""
+        if self._sync_thread is None:
+            self._sync_queue = queue.Queue()
+            self._sync_thread = threading.Thread(target=self._sync_worker, args=(self._sync_queue,))
+            self._sync_thread.start()
+        batch, self._pending = self._pending, []
+        self._sync_queue.put(batch)
+    
+    @staticmethod
+    def _sync_worker(batches):
+        """逐批重新打开文件并同步，收到None后退出"""
+        sync = getattr(os, 'fdatasync', os.fsync)
+        flags = os.O_WRONLY | getattr(os, 'O_BINARY', 0)  # Windows上同步需要写权限
+        for batch in iter(batches.get, None):
+            for file_path in batch:
+                try:
+                    fd = os.open(file_path, flags)
+                except FileNotFoundError:
+                    continue  # 文件已被移动或删除
+                except OSError as e:
+                    print(f"同步文件失败: {file_path}, 错误: {e}")
+                    continue
+                try:
+                    sync(fd)
+                except OSError as e:
+                    print(f"同步文件失败: {file_path}, 错误: {e}")
+                finally:
+                    os.close(fd)
+    
+    def close(self):
+        """把剩余文件交给同步线程后返回，不等待同步完成
+        
+        同步线程不是守护线程，进程退出前仍会完成全部同步
+        """
+        if self._pending:
+            self._submit_sync()
+        if self._sync_thread is not None:
+            self._sync_queue.put(None)
+            self._sync_queue = None
+            self._sync_thread = None
+
 class FileSignatureRecovery:
     """文件签名恢复类，提供基于文件签名的数据恢复功能"""
     
@@ -59,34 +176,33 @@ class FileSignatureRecovery:
                         boot_sector = f.read(512)
                         
                         if len(boot_sector) >= 512:
+                            boot_type = _boot_sector_type(boot_sector)
+                            
                             # 尝试解析FAT32
-                            if boot_sector[0x52:0x5A] == b'FAT32   ':
-                                bytes_per_sector = struct.unpack('<H', boot_sector[0x0B:0x0D])[0]
-                                sectors_per_cluster = boot_sector[0x0D]
+                            if boot_type == 'FAT32':
+                                _, _, bytes_per_sector, sectors_per_cluster = _BPB.unpack_from(boot_sector)
                                 cluster_size = bytes_per_sector * sectors_per_cluster
                                 print(f"镜像文件系统: FAT32, 簇大小: {cluster_size}, 扇区大小: {bytes_per_sector}")
                                 return {'type': 'FAT32', 'cluster_size': cluster_size, 'sector_size': bytes_per_sector}
                             
                             # 尝试解析NTFS
-                            elif boot_sector[3:7] == b'NTFS':
-                                bytes_per_sector = struct.unpack('<H', boot_sector[0x0B:0x0D])[0]
-                                sectors_per_cluster = boot_sector[0x0D]
+                            elif boot_type == 'NTFS':
+                                _, _, bytes_per_sector, sectors_per_cluster = _BPB.unpack_from(boot_sector)
                                 cluster_size = bytes_per_sector * sectors_per_cluster
                                 print(f"镜像文件系统: NTFS, 簇大小: {cluster_size}, 扇区大小: {bytes_per_sector}")
                                 return {'type': 'NTFS', 'cluster_size': cluster_size, 'sector_size': bytes_per_sector}
                             
                             # 尝试查找MBR分区表中的活动分区
-                            elif boot_sector[510:512] == b'\x55\xAA':  # MBR签名
+                            elif boot_type == 'MBR':  # MBR签名
                                 print("检测到MBR，查找活动分区...")
                                 # 分区表从偏移0x1BE开始
                                 for i in range(4):
                                     partition_offset = 0x1BE + i * 16
                                     if partition_offset + 16 <= len(boot_sector):
-                                        partition_entry = boot_sector[partition_offset:partition_offset + 16]
                                         # 检查分区是否活动（第一个字节为0x80）
-                                        if partition_entry[0] == 0x80:
+                                        if boot_sector[partition_offset] == 0x80:
                                             # 获取分区起始扇区
-                                            start_sector = struct.unpack('<L', partition_entry[8:12])[0]
+                                            start_sector = _U32.unpack_from(boot_sector, partition_offset + 8)[0]
                                             print(f"找到活动分区，起始扇区: {start_sector}")
                                             
                                             # 读取分区的引导扇区
@@ -95,15 +211,14 @@ class FileSignatureRecovery:
                                             
                                             if len(partition_boot) >= 512:
                                                 # 再次尝试解析文件系统
-                                                if partition_boot[0x52:0x5A] == b'FAT32   ':
-                                                    bytes_per_sector = struct.unpack('<H', partition_boot[0x0B:0x0D])[0]
-                                                    sectors_per_cluster = partition_boot[0x0D]
+                                                partition_type = _boot_sector_type(partition_boot)
+                                                if partition_type == 'FAT32':
+                                                    _, _, bytes_per_sector, sectors_per_cluster = _BPB.unpack_from(partition_boot)
                                                     cluster_size = bytes_per_sector * sectors_per_cluster
                                                     print(f"分区文件系统: FAT32, 簇大小: {cluster_size}, 扇区大小: {bytes_per_sector}")
                                                     return {'type': 'FAT32', 'cluster_size': cluster_size, 'sector_size': bytes_per_sector}
-                                                elif partition_boot[3:7] == b'NTFS':
-                                                    bytes_per_sector = struct.unpack('<H', partition_boot[0x0B:0x0D])[0]
-                                                    sectors_per_cluster = partition_boot[0x0D]
+                                                elif partition_type == 'NTFS':
+                                                    _, _, bytes_per_sector, sectors_per_cluster = _BPB.unpack_from(partition_boot)
                                                     cluster_size = bytes_per_sector * sectors_per_cluster
                                                     print(f"分区文件系统: NTFS, 簇大小: {cluster_size}, 扇区大小: {bytes_per_sector}")
                                                     return {'type': 'NTFS', 'cluster_size': cluster_size, 'sector_size': bytes_per_sector}
@@ -146,17 +261,17 @@ class FileSignatureRecovery:
                         win32file.CloseHandle(handle)
                         
                         if len(boot_sector) >= 512:
+                            boot_type = _boot_sector_type(boot_sector)
+                            
                             # 尝试解析FAT32
-                            if boot_sector[0x52:0x5A] == b'FAT32   ':
-                                bytes_per_sector = struct.unpack('<H', boot_sector[0x0B:0x0D])[0]
-                                sectors_per_cluster = boot_sector[0x0D]
+                            if boot_type == 'FAT32':
+                                _, _, bytes_per_sector, sectors_per_cluster = _BPB.unpack_from(boot_sector)
                                 cluster_size = bytes_per_sector * sectors_per_cluster
                                 return {'type': 'FAT32', 'cluster_size': cluster_size, 'sector_size': bytes_per_sector}
                             
                             # 尝试解析NTFS
-                            elif boot_sector[3:7] == b'NTFS':
-                                bytes_per_sector = struct.unpack('<H', boot_sector[0x0B:0x0D])[0]
-                                sectors_per_cluster = boot_sector[0x0D]
+                            elif boot_type == 'NTFS':
+                                _, _, bytes_per_sector, sectors_per_cluster = _BPB.unpack_from(boot_sector)
                                 cluster_size = bytes_per_sector * sectors_per_cluster
                                 return {'type': 'NTFS', 'cluster_size': cluster_size, 'sector_size': bytes_per_sector}
                 except Exception as e:
@@ -171,52 +286,27 @@ class FileSignatureRecovery:
             traceback.print_exc()
             return {'type': 'Unknown', 'cluster_size': 4096, 'sector_size': 512}
     
+    # 各类型的结束标记: 扩展名 -> (标记, 标记起点到文件结尾的长度, 是否取最后一个)
+    END_MARKERS = {
+        '.jpg': (b'\xFF\xD9', 2, False),  # JPEG结束标记 FF D9
+        '.jpeg': (b'\xFF\xD9', 2, False),
+        '.png': (b'IEND\xAE\x42\x60\x82', 8, False),  # PNG的IEND块
+        '.gif': (b'\x00\x3B', 2, False),  # GIF结束标记
+        '.pdf': (b'%%EOF', 5, True),  # PDF结束标记，使用最后一个
+        '.zip': (b'PK\x05\x06', 22, True),  # ZIP中央目录结束记录
+    }
+    
     @staticmethod
     def estimate_file_size(data, signature_info, file_offset):
         """根据文件类型和内容估算文件大小"""
         try:
-            file_type = signature_info['type']
-            ext = signature_info['ext']
-            
-            # JPEG文件大小估算
-            if ext in ['.jpg', '.jpeg']:
-                # 查找JPEG结束标记 FF D9
-                end_marker = b'\xFF\xD9'
-                end_pos = data.find(end_marker)
-                if end_pos != -1:
-                    return end_pos + 2
-            
-            # PNG文件大小估算
-            elif ext == '.png':
-                # PNG文件有固定的结构，查找IEND块
-                iend_marker = b'IEND\xAE\x42\x60\x82'
-                end_pos = data.find(iend_marker)
-                if end_pos != -1:
-                    return end_pos + 8
-            
-            # GIF文件大小估算
-            elif ext == '.gif':
-                # 查找GIF结束标记
-                end_marker = b'\x00\x3B'
-                end_pos = data.find(end_marker)
-                if end_pos != -1:
-                    return end_pos + 2
-            
-            # PDF文件大小估算
-            elif ext == '.pdf':
-                # 查找PDF结束标记
-                end_marker = b'%%EOF'
-                end_pos = data.rfind(end_marker)  # 使用rfind查找最后一个
-                if end_pos != -1:
-                    return end_pos + 5
-            
-            # ZIP文件大小估算
-            elif ext == '.zip':
-                # 查找ZIP中央目录结束记录
-                end_marker = b'PK\x05\x06'
-                end_pos = data.rfind(end_marker)
-                if end_pos != -1 and end_pos + 22 <= len(data):
-                    return end_pos + 22
+            # 查表获取结束标记，标记查找由bytes.find/rfind在C层完成
+            marker = FileSignatureRecovery.END_MARKERS.get(signature_info['ext'])
+            if marker is not None:
+                end_marker, tail_size, from_end = marker
+                end_pos = data.rfind(end_marker) if from_end else data.find(end_marker)
+                if end_pos != -1 and end_pos + tail_size <= len(data):
+                    return end_pos + tail_size
             
             # 默认大小限制
             default_size = min(len(data), 10 * 1024 * 1024)  # 最大10MB
@@ -374,9 +464,12 @@ class FileSignatureRecovery:
             file_type = info['type']
             if file_type not in type_dirs:
                 type_dir = os.path.join(save_dir, file_type)
-                os.makedirs(type_dir, exist_ok=True)
+                _ensure_dir(type_dir)
                 type_dirs[file_type] = type_dir
         
+        # 恢复文件写入器，扫描结束后统一同步
+        file_writer = FileWriter()
+        
         # 恢复文件
         recovered_files = []
         total_files_found = 0
@@ -490,12 +583,8 @@ class FileSignatureRecovery:
                                             print(f"\n跳过文件: 无法读取数据 (偏移: 0x{file_offset:x})")
                                             continue
                                         
-                                        # 确保目录存在
-                                        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                                        
-                                        # 保存文件
-                                        with open(file_path, 'wb') as f:
-                                            f.write(file_data)
+                                        # 保存文件（目录由写入器按需创建一次）
+                                        file_writer.write(file_path, file_data)
                                         
                                         # 验证文件是否成功保存
                                         if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
@@ -661,12 +750,8 @@ class FileSignatureRecovery:
                                                 print(f"\n跳过文件: 无法读取数据 (偏移: 0x{file_offset:x})")
                                                 continue
                                             
-                                            # 确保目录存在
-                                            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                                            
-                                            # 保存文件
-                                            with open(file_path, 'wb') as f:
-                                                f.write(file_data)
+                                            # 保存文件（目录由写入器按需创建一次）
+                                            file_writer.write(file_path, file_data)
                                             
                                             # 验证文件是否成功保存
                                             if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
@@ -819,8 +904,7 @@ class FileSignatureRecovery:
                                     
                                     # 写入文件
                                     try:
-                                        with open(file_path, 'wb') as output_file:
-                                            output_file.write(file_data)
+                                        file_writer.write(file_path, file_data)
                                     except Exception as e:
                                         print(f"写入恢复文件错误: {e}")
                                         offset = pos + sig_len
@@ -852,6 +936,8 @@ class FileSignatureRecovery:
         except Exception as e:
             print(f"Error recovering files: {e}")
             traceback.print_exc()
+        finally:
+            file_writer.close()
         
         # 创建恢复摘要文件
         summary_path = os.path.join(save_dir, "恢复摘要.txt")
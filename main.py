@@ -7,6 +7,7 @@ import ctypes
 import traceback
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from disk_recovery_tool import DiskRecoveryTool
+from ui_components import install_button_styles
 
 def is_admin():
     """检查程序是否以管理员权限运行"""
@@ -52,6 +53,7 @@ def main():
         
         print("创建QApplication...")
         app = QApplication(sys.argv)
+        install_button_styles(app)  # 对话框按钮样式只在启动时解析一次
         
         # 设置全局异常处理器
         def handle_exception(exc_type, exc_value, exc_traceback):
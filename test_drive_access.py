@@ -8,9 +8,17 @@ import os
 import sys
 import tempfile
 from pathlib import Path
+from testing_utils import run_tests_concurrently
+
+# 驱动器检测结果缓存，None表示尚未检测
+_DETECTED_DRIVES = None
 
 def test_drive_detection():
-    """测试驱动器检测"""
+    """测试驱动器检测（结果会被缓存，避免重复枚举驱动器）"""
+    global _DETECTED_DRIVES
+    if _DETECTED_DRIVES is not None:
+        return _DETECTED_DRIVES
+    
     print("=== 测试驱动器检测 ===")
     try:
         # 获取所有可用驱动器
@@ -21,12 +29,12 @@ def test_drive_detection():
                 drives.append(letter)
                 print(f"✓ 发现驱动器: {letter}:")
         
+        _DETECTED_DRIVES = drives
         if drives:
             print(f"✓ 总共发现 {len(drives)} 个驱动器: {', '.join([d+':' for d in drives])}")
-            return drives
         else:
             print("✗ 未发现任何驱动器")
-            return []
+        return drives
             
     except Exception as e:
         print(f"✗ 驱动器检测失败: {e}")
@@ -46,12 +54,12 @@ def test_disk_image_with_drive(drive_letter):
             f"{drive_letter.lower()}:\\"
         ]
         
+        # 创建磁盘镜像快照对象（各路径格式共享同一个大小缓存）
+        snapshot = DiskImageSnapshot()
+        
         for path in test_paths:
             print(f"\n测试路径格式: {path}")
             
-            # 创建磁盘镜像快照对象
-            snapshot = DiskImageSnapshot()
-            
             # 测试获取磁盘大小
             disk_size = snapshot.get_disk_size(path)
             if disk_size > 0:
@@ -72,19 +80,24 @@ def test_disk_image_with_drive(drive_letter):
         print(f"✗ 磁盘镜像测试失败: {e}")
         return False
 
-def test_specific_drive_g():
+def test_specific_drive_g(drives=None):
     """专门测试G盘"""
     print("\n=== 专门测试G盘 ===")
     
-    # 检查G盘是否存在
-    g_drive_paths = ["G:\\", "G:"]
+    # 检查G盘是否存在（已有检测结果时直接使用）
     g_exists = False
     
-    for path in g_drive_paths:
-        if os.path.exists(path):
+    if drives is not None:
+        if 'G' in drives:
             g_exists = True
-            print(f"✓ G盘存在: {path}")
-            break
+            print("✓ G盘存在: G:\\")
+    else:
+        g_drive_paths = ["G:\\", "G:"]
+        for path in g_drive_paths:
+            if os.path.exists(path):
+                g_exists = True
+                print(f"✓ G盘存在: {path}")
+                break
     
     if not g_exists:
         print("✗ G盘不存在，跳过G盘测试")
@@ -132,7 +145,8 @@ def test_win32_availability():
         # 测试基本API
         try:
             drives = win32api.GetLogicalDriveStrings()
-            print(f"✓ 获取逻辑驱动器成功: {drives.split('\x00')[:-1]}")
+            drive_list = drives.split('\x00')[:-1]
+            print(f"✓ 获取逻辑驱动器成功: {drive_list}")
         except Exception as e:
             print(f"✗ 获取逻辑驱动器失败: {e}")
         
@@ -147,28 +161,30 @@ def main():
     print("驱动器访问和磁盘镜像功能测试")
     print("=" * 60)
     
+    # 驱动器只检测一次，后续测试复用结果
+    drives = test_drive_detection()
+    
     tests = [
         test_win32_availability,
         test_wmic_command,
-        test_drive_detection,
-        test_specific_drive_g,
+        lambda: test_specific_drive_g(drives),
     ]
     
-    passed = 0
-    total = len(tests)
-    
-    for test in tests:
-        if test():
-            passed += 1
-    
     # 如果发现了驱动器，测试第一个可用驱动器
-    drives = test_drive_detection()
     if drives:
         first_drive = drives[0]
-        print(f"\n=== 测试第一个可用驱动器 {first_drive}: ===")
-        if test_disk_image_with_drive(first_drive):
-            passed += 1
-        total += 1
+        
+        def test_first_drive():
+            print(f"\n=== 测试第一个可用驱动器 {first_drive}: ===")
+            return test_disk_image_with_drive(first_drive)
+        
+        tests.append(test_first_drive)
+    
+    # 各测试都阻塞在I/O上（WMIC、磁盘探测），并行执行；输出按测试列表顺序写出
+    results = run_tests_concurrently(tests)
+    
+    passed = (1 if drives else 0) + sum(1 for result in results if result)
+    total = len(tests) + 1
     
     print("\n" + "=" * 60)
     print(f"测试结果: {passed}/{total} 通过")
@@ -6,14 +6,23 @@ FAT32磁盘镜像恢复功能测试
 
 import sys
 import os
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QObject
+import inspect
+from functools import lru_cache
+from PyQt5.QtCore import QCoreApplication, QObject
 
 # 添加项目路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from fat32_recovery import FAT32Recovery
 
+# 需要存在的恢复方法
+EXPECTED_METHODS = {'recover_files', '_recover_with_disk_image', '_recover_direct'}
+
+@lru_cache(maxsize=None)
+def _method_signature(cls, name):
+    """获取方法签名（按类和方法名缓存）"""
+    return inspect.signature(getattr(cls, name))
+
 class TestSignalReceiver(QObject):
     """测试信号接收器"""
     
@@ -38,8 +47,8 @@ def test_fat32_disk_image_recovery():
     print("=" * 50)
     
     try:
-        # 创建QApplication（Qt信号需要事件循环）
-        app = QApplication(sys.argv)
+        # 创建QCoreApplication（Qt信号需要事件循环，无需加载GUI模块）
+        app = QCoreApplication.instance() or QCoreApplication(sys.argv)
         
         # 创建FAT32Recovery实例
         recovery = FAT32Recovery()
@@ -58,28 +67,18 @@ def test_fat32_disk_image_recovery():
         else:
             print("⚠ 磁盘镜像快照功能不可用，将使用直接访问方法")
         
-        # 检查方法是否存在
-        if hasattr(recovery, 'recover_files'):
-            print("✓ recover_files方法存在")
-        else:
-            print("✗ recover_files方法不存在")
-            return False
-        
-        if hasattr(recovery, '_recover_with_disk_image'):
-            print("✓ _recover_with_disk_image方法存在")
-        else:
-            print("✗ _recover_with_disk_image方法不存在")
-            return False
-        
-        if hasattr(recovery, '_recover_direct'):
-            print("✓ _recover_direct方法存在")
-        else:
-            print("✗ _recover_direct方法不存在")
+        # 检查方法是否存在（一次性取属性集合）
+        missing = EXPECTED_METHODS - set(dir(recovery))
+        for name in sorted(EXPECTED_METHODS):
+            if name in missing:
+                print(f"✗ {name}方法不存在")
+            else:
+                print(f"✓ {name}方法存在")
+        if missing:
             return False
         
         # 测试方法签名
-        import inspect
-        sig = inspect.signature(recovery.recover_files)
+        sig = _method_signature(FAT32Recovery, 'recover_files')
         params = list(sig.parameters.keys())
         expected_params = ['disk_path', 'output_dir', 'use_disk_image']
         
@@ -7,7 +7,7 @@
 
 import os
 import sys
-from file_signature_recovery import FileSignatureRecovery
+from file_signature_recovery import FileSignatureRecovery, FileWriter, _ensure_dir
 
 def test_file_save_fix():
     """测试文件保存修复"""
@@ -16,7 +16,7 @@ def test_file_save_fix():
     try:
         # 创建测试目录
         test_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_save_fix")
-        os.makedirs(test_dir, exist_ok=True)
+        _ensure_dir(test_dir)
         print(f"测试目录: {test_dir}")
         
         # 测试文件大小估算函数
@@ -53,7 +53,7 @@ def test_file_save_fix():
         
         # 创建类型目录
         type_dir = os.path.join(test_dir, "图片")
-        os.makedirs(type_dir, exist_ok=True)
+        _ensure_dir(type_dir)
         print(f"类型目录: {type_dir}")
         
         # 模拟文件保存过程
@@ -64,12 +64,9 @@ def test_file_save_fix():
         print(f"保存文件: {file_path}")
         print(f"文件大小: {len(file_data)} 字节")
         
-        # 确保目录存在
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        # 保存文件
-        with open(file_path, 'wb') as f:
-            f.write(file_data)
+        # 保存文件（写入器负责创建目录，退出时统一同步）
+        with FileWriter() as writer:
+            writer.write(file_path, file_data)
         
         # 验证文件保存
         if os.path.exists(file_path):
@@ -7,31 +7,34 @@
 import os
 import sys
 import tempfile
+from functools import lru_cache
 
 # 添加项目根目录到Python路径
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
+@lru_cache(maxsize=1)
+def find_image_files():
+    """查找项目目录中的镜像文件（只查找一次）"""
+    return tuple(entry.path for entry in os.scandir(project_root)
+                 if entry.name.endswith('.img') and entry.is_file())
+
 def test_image_cluster_info():
     """测试镜像文件的簇信息获取"""
     print("=== 测试镜像文件簇信息获取 ===\n")
     
     try:
         from file_signature_recovery import FileSignatureRecovery
+        from testing_utils import warm_cache
         
-        # 查找现有的镜像文件
-        image_files = []
-        for file in os.listdir(project_root):
-            if file.endswith('.img'):
-                image_path = os.path.join(project_root, file)
-                image_files.append(image_path)
-        
+        image_files = find_image_files()
         if not image_files:
             print("未找到镜像文件，跳过测试")
             return False
         
         # 测试第一个镜像文件
         test_image = image_files[0]
+        warm_cache(test_image)
         print(f"测试镜像文件: {test_image}")
         print(f"镜像大小: {os.path.getsize(test_image):,} 字节")
         
@@ -64,14 +67,9 @@ def test_image_signature_recovery():
     
     try:
         from file_signature_recovery import FileSignatureRecovery
+        from testing_utils import warm_cache
         
-        # 查找现有的镜像文件
-        image_files = []
-        for file in os.listdir(project_root):
-            if file.endswith('.img'):
-                image_path = os.path.join(project_root, file)
-                image_files.append(image_path)
-        
+        image_files = find_image_files()
         if not image_files:
             print("未找到镜像文件，跳过测试")
             return False
@@ -82,6 +80,7 @@ def test_image_signature_recovery():
             os.makedirs(recovery_dir, exist_ok=True)
             
             test_image = image_files[0]
+            warm_cache(test_image)
             print(f"测试镜像文件: {test_image}")
             print(f"恢复目录: {recovery_dir}")
             
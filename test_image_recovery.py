@@ -8,36 +8,22 @@ import os
 import sys
 import tempfile
 from file_signature_recovery import FileSignatureRecovery
+from testing_utils import create_test_image, warm_cache
 
-def create_test_image():
-    """创建一个包含测试文件的镜像"""
-    # 创建临时镜像文件
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.img') as temp_file:
-        image_path = temp_file.name
-        
-        # 写入一些测试数据和文件签名
-        # JPEG文件签名
-        jpeg_header = bytes.fromhex('FFD8FFE0')
-        jpeg_data = jpeg_header + b'\x00' * 1000  # 模拟JPEG文件
-        
-        # PNG文件签名
-        png_header = bytes.fromhex('89504E470D0A1A0A')
-        png_data = png_header + b'\x00' * 1000  # 模拟PNG文件
-        
-        # PDF文件签名
-        pdf_header = b'%PDF-1.4'
-        pdf_data = pdf_header + b'\x00' * 1000  # 模拟PDF文件
-        
-        # 写入镜像文件
-        temp_file.write(b'\x00' * 1024)  # 填充数据
-        temp_file.write(jpeg_data)
-        temp_file.write(b'\x00' * 1024)  # 填充数据
-        temp_file.write(png_data)
-        temp_file.write(b'\x00' * 1024)  # 填充数据
-        temp_file.write(pdf_data)
-        temp_file.write(b'\x00' * 1024)  # 填充数据
-        
-    return image_path
+def print_tree(path, level=0):
+    """打印目录结构（使用scandir，文件类型和大小取自目录项缓存）"""
+    indent = ' ' * 2 * level
+    print(f"{indent}{os.path.basename(path)}/")
+    subindent = ' ' * 2 * (level + 1)
+    subdirs = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            else:
+                print(f"{subindent}{entry.name} ({entry.stat().st_size} 字节)")
+    for subdir in subdirs:
+        print_tree(subdir, level + 1)
 
 def test_image_recovery():
     """测试镜像文件恢复"""
@@ -46,6 +32,7 @@ def test_image_recovery():
     # 创建测试镜像
     print("创建测试镜像...")
     image_path = create_test_image()
+    warm_cache(image_path)
     print(f"测试镜像路径: {image_path}")
     print(f"镜像大小: {os.path.getsize(image_path)} 字节")
     
@@ -88,15 +75,7 @@ def test_image_recovery():
         
         # 检查输出目录结构
         print(f"\n=== 输出目录结构 ===")
-        for root, dirs, files in os.walk(output_dir):
-            level = root.replace(output_dir, '').count(os.sep)
-            indent = ' ' * 2 * level
-            print(f"{indent}{os.path.basename(root)}/")
-            subindent = ' ' * 2 * (level + 1)
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_size = os.path.getsize(file_path)
-                print(f"{subindent}{file} ({file_size} 字节)")
+        print_tree(output_dir)
         
         return len(recovered_files) > 0
         
@@ -107,14 +86,7 @@ def test_image_recovery():
         return False
         
     finally:
-        # 清理测试文件
-        try:
-            os.unlink(image_path)
-            print(f"\n已删除测试镜像: {image_path}")
-        except:
-            pass
-        
-        # 注意: 不删除输出目录，以便检查结果
+        # 注意: 测试镜像在进程退出时删除，不删除输出目录，以便检查结果
         print(f"输出目录保留: {output_dir}")
 
 if __name__ == '__main__':
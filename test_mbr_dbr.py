@@ -6,109 +6,201 @@
 
 import sys
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from disk_utils import DiskManager
 from ui_components import FileSystemTree
 
-def test_mbr_dbr_reading():
-    """测试MBR和DBR读取功能"""
-    print("=== 测试MBR和DBR读取功能 ===")
+# DBR前90字节中的文件系统标识，一次匹配所有标识
+FS_SIGNATURE_RE = re.compile(rb'FAT32|NTFS|EXFAT')
+FS_SIGNATURE_NAMES = {b'FAT32': 'FAT32', b'NTFS': 'NTFS', b'EXFAT': 'exFAT'}
+
+# 完整DBR的输出模板
+DBR_TEMPLATE = (
+    "  分区 {index} DBR (起始扇区: {start_sector}):\n"
+    "    DBR数据长度: {length} 字节\n"
+    "    前16字节: {head}\n"
+    "    引导签名: {boot_signature}\n"
+    "    文件系统: {fs_name}"
+)
+
+# MBR分区类型字节已能确定文件系统的类型，这些分区默认不再读取DBR
+FS_FROM_PARTITION_TYPE = {0x07: 'NTFS/exFAT', 0x0B: 'FAT32', 0x0C: 'FAT32', 0x27: 'NTFS'}
+
+def test_mbr_dbr_reading(verify_dbr=False):
+    """测试MBR和DBR读取功能
+    
+    verify_dbr: 为True时即使分区类型已知也读取DBR校验文件系统签名
+    """
+    # 输出先缓存，每个步骤结束时一次性写出
+    lines = []
+    
+    def emit(text=''):
+        lines.append(f"{text}\n")
+    
+    def flush_section():
+        sys.stdout.writelines(lines)
+        lines.clear()
+    
+    emit("=== 测试MBR和DBR读取功能 ===")
     
     # 创建磁盘管理器
     disk_manager = DiskManager()
     
     # 获取可用磁盘
-    print("\n1. 获取可用磁盘...")
+    emit("\n1. 获取可用磁盘...")
     try:
         disks = disk_manager.get_physical_disks()
-        print(f"找到 {len(disks)} 个磁盘:")
+        emit(f"找到 {len(disks)} 个磁盘:")
         for i, disk in enumerate(disks):
-            print(f"  {i+1}. {disk.get('name', 'Unknown')} - {disk.get('path', 'Unknown')}")
+            emit(f"  {i+1}. {disk.get('name', 'Unknown')} - {disk.get('path', 'Unknown')}")
     except Exception as e:
-        print(f"获取磁盘列表失败: {e}")
+        emit(f"获取磁盘列表失败: {e}")
+        flush_section()
         return
     
     if not disks:
-        print("没有找到可用磁盘")
+        emit("没有找到可用磁盘")
+        flush_section()
         return
     
-    # 选择第一个磁盘进行测试
-    test_disk = disks[0]
-    disk_path = test_disk['path']
-    print(f"\n2. 测试磁盘: {disk_path}")
+    flush_section()
+    
+    # 每个磁盘独立探测，并行执行以重叠各磁盘的I/O，输出按磁盘顺序整体写出
+    with ThreadPoolExecutor(max_workers=len(disks)) as executor:
+        for disk_lines in executor.map(lambda disk: check_disk(disk['path'], verify_dbr), disks):
+            sys.stdout.writelines(disk_lines)
+    
+    print("\n=== 测试完成 ===")
+
+def check_disk(disk_path, verify_dbr=False):
+    """读取并检查一个磁盘的MBR和DBR，返回输出行列表"""
+    lines = []
+    
+    def emit(text=''):
+        lines.append(f"{text}\n")
+    
+    disk_manager = DiskManager()
+    emit(f"\n2. 测试磁盘: {disk_path}")
     
     # 测试获取磁盘信息
-    print("\n3. 获取磁盘信息...")
+    emit("\n3. 获取磁盘信息...")
     try:
         disk_info = disk_manager.get_disk_info(disk_path)
-        print(f"磁盘类型: {disk_info.get('type', 'Unknown')}")
-        print(f"磁盘大小: {disk_info.get('size_human', 'Unknown')}")
+        emit(f"磁盘类型: {disk_info.get('type', 'Unknown')}")
+        emit(f"磁盘大小: {disk_info.get('size_human', 'Unknown')}")
         
         if 'mbr_signature' in disk_info:
-            print(f"MBR签名: {disk_info['mbr_signature']}")
+            emit(f"MBR签名: {disk_info['mbr_signature']}")
         
         if 'partitions' in disk_info:
-            print(f"分区数量: {len(disk_info['partitions'])}")
+            emit(f"分区数量: {len(disk_info['partitions'])}")
             for i, partition in enumerate(disk_info['partitions']):
-                print(f"  分区 {i+1}:")
-                print(f"    类型: {partition.get('type_name', 'Unknown')}")
-                print(f"    状态: {partition.get('status', 'Unknown')}")
-                print(f"    起始扇区: {partition.get('start_sector', 'Unknown')}")
-                print(f"    大小: {partition.get('size_human', 'Unknown')}")
+                emit(f"  分区 {i+1}:")
+                emit(f"    类型: {partition.get('type_name', 'Unknown')}")
+                emit(f"    状态: {partition.get('status', 'Unknown')}")
+                emit(f"    起始扇区: {partition.get('start_sector', 'Unknown')}")
+                emit(f"    大小: {partition.get('size_human', 'Unknown')}")
         else:
-            print("没有找到分区信息")
+            emit("没有找到分区信息")
     except Exception as e:
-        print(f"获取磁盘信息失败: {e}")
-        return
+        emit(f"获取磁盘信息失败: {e}")
+        return lines
+    
+    # MBR与所有分区DBR: 优先通过内存映射直接访问，不支持映射时批量读取
+    is_logical_drive = disk_info.get('is_logical_drive', False)
+    partitions = disk_info.get('partitions') or []
+    # 按起始扇区升序读取DBR，保持顺序访问（保留原分区序号用于显示）
+    partition_order = sorted(range(len(partitions)), key=lambda i: partitions[i].get('start_sector', 0))
+    dbr_order = [i for i in partition_order
+                 if verify_dbr or partitions[i].get('type') not in FS_FROM_PARTITION_TYPE]
+    sector_requests = [(partitions[i].get('start_sector', 0), 1) for i in dbr_order]
+    if not is_logical_drive:
+        sector_requests.insert(0, (0, 1))
+    
+    read_error = None
+    try:
+        end_sector = max(start + count for start, count in sector_requests)
+        region = disk_manager.map_region(disk_path, 0, end_sector * 512)
+        sector_data = [region[start * 512:(start + count) * 512] for start, count in sector_requests]
+    except Exception:
+        try:
+            sector_data = disk_manager.read_sectors_batch(disk_path, sector_requests)
+        except Exception as e:
+            read_error = e
+            sector_data = []
     
     # 测试读取MBR（仅对物理磁盘）
-    print("\n4. 测试读取MBR...")
-    if disk_info.get('is_logical_drive', False):
-        print("跳过MBR读取: 逻辑驱动器没有MBR")
+    emit("\n4. 测试读取MBR...")
+    if is_logical_drive:
+        emit("跳过MBR读取: 逻辑驱动器没有MBR")
+        dbr_list = sector_data
     else:
-        try:
-            mbr_data = disk_manager.read_sectors(disk_path, 0, 1)
-            if mbr_data:
-                print(f"MBR数据长度: {len(mbr_data)} 字节")
-                print(f"MBR签名: {mbr_data[510:512].hex() if len(mbr_data) >= 512 else 'N/A'}")
-                print(f"前16字节: {mbr_data[:16].hex() if len(mbr_data) >= 16 else 'N/A'}")
+        dbr_list = sector_data[1:]
+        if read_error:
+            emit(f"读取MBR失败: {read_error}")
+        else:
+            mbr_data = sector_data[0]
+            mbr_length = len(mbr_data)
+            if mbr_length:
+                signature = mbr_data[510:512].hex() if mbr_length >= 512 else 'N/A'
+                head = mbr_data[:16].hex() if mbr_length >= 16 else 'N/A'
+                emit(f"MBR数据长度: {mbr_length} 字节")
+                emit(f"MBR签名: {signature}")
+                emit(f"前16字节: {head}")
+                
+                # 逐项解析已读取的MBR分区表，与get_disk_info的结果对照
+                if partitions and mbr_length >= 512:
+                    table_starts = sorted(partition['start_sector']
+                                          for partition in disk_manager.iter_mbr_partitions(mbr_data))
+                    info_starts = sorted(partition.get('start_sector', 0) for partition in partitions)
+                    emit(f"分区表校验: {'一致' if table_starts == info_starts else '不一致'}")
             else:
-                print("读取MBR失败: 返回空数据")
-        except Exception as e:
-            print(f"读取MBR失败: {e}")
+                emit("读取MBR失败: 返回空数据")
     
     # 测试读取DBR（如果有分区）
-    if 'partitions' in disk_info and disk_info['partitions']:
-        print("\n5. 测试读取DBR...")
-        for i, partition in enumerate(disk_info['partitions']):
+    if partitions:
+        emit("\n5. 测试读取DBR...")
+        if read_error:
+            emit(f"  批量读取DBR失败: {read_error}")
+        
+        dbr_by_partition = dict(zip(dbr_order, dbr_list))
+        for i in partition_order:
+            start_sector = partitions[i].get('start_sector', 0)
+            if i not in dbr_by_partition:
+                partition_type = partitions[i].get('type')
+                if partition_type in FS_FROM_PARTITION_TYPE and not verify_dbr:
+                    # 分区类型已确定文件系统，不读取DBR（--verify-dbr 时读取校验）
+                    emit(f"  分区 {i+1} (起始扇区: {start_sector}): "
+                         f"文件系统: {FS_FROM_PARTITION_TYPE[partition_type]} (来自分区类型)")
+                continue
+            
+            dbr_data = dbr_by_partition[i]
             try:
-                start_sector = partition.get('start_sector', 0)
-                print(f"  分区 {i+1} DBR (起始扇区: {start_sector}):")
-                
-                dbr_data = disk_manager.read_sectors(disk_path, start_sector, 1)
-                if dbr_data:
-                    print(f"    DBR数据长度: {len(dbr_data)} 字节")
-                    print(f"    前16字节: {dbr_data[:16].hex() if len(dbr_data) >= 16 else 'N/A'}")
-                    
-                    # 检查文件系统签名
-                    if len(dbr_data) >= 512:
-                        if dbr_data[510:512] == b'\x55\xAA':
-                            print(f"    引导签名: 有效 (0x55AA)")
-                        else:
-                            print(f"    引导签名: 无效或缺失")
-                        
-                        # 检查文件系统类型
-                        if b'FAT32' in dbr_data[:90]:
-                            print(f"    文件系统: FAT32")
-                        elif b'NTFS' in dbr_data[:90]:
-                            print(f"    文件系统: NTFS")
-                        else:
-                            print(f"    文件系统: 未知")
+                dbr_length = len(dbr_data)
+                if dbr_length >= 512:
+                    # 完整的DBR: 检查引导签名和文件系统类型，一次格式化全部输出
+                    match = FS_SIGNATURE_RE.search(dbr_data, 0, 90)
+                    emit(DBR_TEMPLATE.format_map({
+                        'index': i + 1,
+                        'start_sector': start_sector,
+                        'length': dbr_length,
+                        'head': dbr_data[:16].hex(),
+                        'boot_signature': '有效 (0x55AA)' if dbr_data[510] == 0x55 and dbr_data[511] == 0xAA else '无效或缺失',
+                        'fs_name': FS_SIGNATURE_NAMES[match.group()] if match else '未知',
+                    }))
                 else:
-                    print(f"    读取DBR失败: 返回空数据")
+                    emit(f"  分区 {i+1} DBR (起始扇区: {start_sector}):")
+                    if dbr_length:
+                        head = dbr_data[:16].hex() if dbr_length >= 16 else 'N/A'
+                        emit(f"    DBR数据长度: {dbr_length} 字节")
+                        emit(f"    前16字节: {head}")
+                    else:
+                        emit(f"    读取DBR失败: 返回空数据")
             except Exception as e:
-                print(f"    读取分区 {i+1} DBR失败: {e}")
+                emit(f"    读取分区 {i+1} DBR失败: {e}")
     
-    print("\n=== 测试完成 ===")
+    return lines
 
 if __name__ == '__main__':
-    test_mbr_dbr_reading()
\ No newline at end of file
+    test_mbr_dbr_reading(verify_dbr='--verify-dbr' in sys.argv[1:])
\ No newline at end of file
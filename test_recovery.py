@@ -3,34 +3,48 @@
 
 import sys
 import os
-from PyQt5.QtWidgets import QApplication
-from fat32_recovery import FAT32Recovery
-from ntfs_recovery import NTFSRecovery
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+
+# 恢复类需要提供的信号和方法
+RECOVERY_SIGNALS = {'progress_updated', 'status_updated'}
+RECOVERY_METHODS = {'recover_files'}
+
+# 测试中按需导入的模块，运行测试前并行预先导入
+TEST_MODULES = ['fat32_recovery', 'ntfs_recovery', 'disk_recovery_tool']
+
+def check_recovery_interface(recovery):
+    """检查恢复实例的信号和方法（只取一次属性集合）"""
+    names = set(dir(recovery))
+    
+    # 检查信号是否正确定义
+    if RECOVERY_SIGNALS <= names:
+        print("✓ 信号定义正确")
+    else:
+        print("✗ 信号定义错误")
+        return False
+    
+    # 检查recover_files方法是否存在
+    if RECOVERY_METHODS <= names:
+        print("✓ recover_files方法存在")
+    else:
+        print("✗ recover_files方法不存在")
+        return False
+    
+    return True
 
 def test_fat32_recovery():
     """测试FAT32恢复功能"""
     print("测试FAT32恢复功能...")
     
     try:
+        from fat32_recovery import FAT32Recovery
+        
         # 创建FAT32Recovery实例
         recovery = FAT32Recovery()
         print("✓ FAT32Recovery实例创建成功")
         
-        # 检查信号是否正确定义
-        if hasattr(recovery, 'progress_updated') and hasattr(recovery, 'status_updated'):
-            print("✓ 信号定义正确")
-        else:
-            print("✗ 信号定义错误")
-            return False
-            
-        # 检查recover_files方法是否存在
-        if hasattr(recovery, 'recover_files'):
-            print("✓ recover_files方法存在")
-        else:
-            print("✗ recover_files方法不存在")
-            return False
-            
-        return True
+        return check_recovery_interface(recovery)
         
     except Exception as e:
         print(f"✗ FAT32恢复测试失败: {e}")
@@ -41,25 +55,13 @@ def test_ntfs_recovery():
     print("\n测试NTFS恢复功能...")
     
     try:
+        from ntfs_recovery import NTFSRecovery
+        
         # 创建NTFSRecovery实例
         recovery = NTFSRecovery()
         print("✓ NTFSRecovery实例创建成功")
         
-        # 检查信号是否正确定义
-        if hasattr(recovery, 'progress_updated') and hasattr(recovery, 'status_updated'):
-            print("✓ 信号定义正确")
-        else:
-            print("✗ 信号定义错误")
-            return False
-            
-        # 检查recover_files方法是否存在
-        if hasattr(recovery, 'recover_files'):
-            print("✓ recover_files方法存在")
-        else:
-            print("✗ recover_files方法不存在")
-            return False
-            
-        return True
+        return check_recovery_interface(recovery)
         
     except Exception as e:
         print(f"✗ NTFS恢复测试失败: {e}")
@@ -94,8 +96,9 @@ def main():
     print("磁盘恢复功能测试")
     print("=" * 50)
     
-    # 创建QApplication（Qt信号需要事件循环）
-    app = QApplication(sys.argv)
+    # 创建QApplication（Qt信号需要事件循环），只在运行测试时导入QtWidgets
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
     
     # 运行测试
     tests = [
@@ -104,12 +107,15 @@ def main():
         test_recovery_worker
     ]
     
-    passed = 0
-    total = len(tests)
+    # 耗时主要在模块导入上：在线程池中并行导入各测试用到的模块，
+    # 测试本身在主线程中按顺序运行（QObject实例只在主线程中创建，输出顺序固定）
+    with ThreadPoolExecutor(max_workers=len(TEST_MODULES)) as executor:
+        list(executor.map(importlib.import_module, TEST_MODULES))
+    
+    results = [test() for test in tests]
     
-    for test in tests:
-        if test():
-            passed += 1
+    passed = sum(1 for result in results if result)
+    total = len(tests)
     
     print("\n" + "=" * 50)
     print(f"测试结果: {passed}/{total} 通过")
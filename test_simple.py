@@ -2,20 +2,25 @@
 
 import sys
 import traceback
+import importlib.util
 
 print("Testing basic imports...")
 
 try:
     print("1. Testing PyQt5...")
-    from PyQt5.QtWidgets import QApplication, QMainWindow
-    print("   ✓ PyQt5 imported successfully")
+    # Only check that PyQt5 is installed; QtWidgets is imported when needed
+    if importlib.util.find_spec('PyQt5') is None:
+        raise ImportError("No module named 'PyQt5'")
+    print("   ✓ PyQt5 found")
     
     print("2. Testing DiskRecoveryTool import...")
     from disk_recovery_tool import DiskRecoveryTool
     print("   ✓ DiskRecoveryTool imported successfully")
     
     print("3. Testing class instantiation...")
-    app = QApplication(sys.argv)
+    # DiskRecoveryTool is a main window, so it needs a QApplication
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
     window = DiskRecoveryTool()
     print("   ✓ DiskRecoveryTool created successfully")
     
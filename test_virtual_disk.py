@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试虚拟分区创建失败时的临时文件清理
+"""
+
+import os
+import sys
+import tempfile
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, project_root)
+
+import virtual_disk
+from virtual_disk import VirtualDisk
+
+def test_partition_writer_failure_removes_raw_tmp():
+    """分区写入出错时不应留下.raw.tmp临时镜像"""
+    print("=== 测试分区写入失败时清理临时raw镜像 ===")
+    
+    vd = VirtualDisk()
+    
+    def failing_writer(file_obj, size_bytes):
+        file_obj.write(b'\x00' * 512)
+        raise OSError("模拟分区写入失败")
+    
+    # 不依赖系统中是否安装qemu-img：写入在转换之前就失败
+    original_which = virtual_disk.shutil.which
+    virtual_disk.shutil.which = lambda name: f'/usr/bin/{name}'
+    vd._create_fat32_partition = failing_writer
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, 'partition.qcow2')
+            try:
+                vd.create_virtual_partition(4, 'FAT32', output_path, image_type='qcow2')
+                print("✗ 分区写入失败没有抛出异常")
+                raised = False
+            except OSError as e:
+                print(f"✓ 抛出异常: {e}")
+                raised = True
+            
+            leftovers = os.listdir(temp_dir)
+            if leftovers:
+                print(f"✗ 遗留文件: {leftovers}")
+            else:
+                print("✓ 没有遗留临时文件")
+    finally:
+        virtual_disk.shutil.which = original_which
+    
+    assert raised and not leftovers
+    return raised and not leftovers
+
+def main():
+    """主测试函数"""
+    try:
+        success = test_partition_writer_failure_removes_raw_tmp()
+    except AssertionError:
+        success = False
+    print("\n✓ 测试通过" if success else "\n✗ 测试失败")
+    return 0 if success else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
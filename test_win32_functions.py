@@ -4,84 +4,109 @@
 测试win32api和win32file模块的具体函数
 """
 
+# 所有探测共用的驱动器根路径
+TEST_DRIVE_ROOT = "C:\\"
+
+# 需要探测的函数名
+_WIN32API_PROBE_NAMES = ('GetLogicalDriveStrings', 'GetDriveType', 'GetVolumeInformation')
+_WIN32FILE_PROBE_NAMES = ('GetDiskFreeSpaceEx', 'GetDriveType')
+
+# 导入时一次性完成模块与函数探测，测试中直接按表分支
+try:
+    import win32api
+    _WIN32API_IMPORT_ERROR = None
+except ImportError as e:
+    win32api = None
+    _WIN32API_IMPORT_ERROR = e
+
+try:
+    import win32file
+    _WIN32FILE_IMPORT_ERROR = None
+except ImportError as e:
+    win32file = None
+    _WIN32FILE_IMPORT_ERROR = e
+
+_W32 = {n: getattr(win32api, n, None) for n in _WIN32API_PROBE_NAMES}
+_W32FILE = {n: getattr(win32file, n, None) for n in _WIN32FILE_PROBE_NAMES}
+
 def test_win32_modules():
     """测试win32模块的具体函数"""
     print("正在测试win32模块...")
     
     # 测试win32api
-    try:
-        import win32api
+    if win32api is None:
+        print(f"✗ win32api模块导入失败: {_WIN32API_IMPORT_ERROR}")
+    else:
         print("✓ win32api模块导入成功")
         
         # 测试GetLogicalDriveStrings
-        try:
-            drives = win32api.GetLogicalDriveStrings()
-            print(f"✓ GetLogicalDriveStrings: {drives.split(chr(0))[:-1]}")
-        except AttributeError:
+        fn = _W32['GetLogicalDriveStrings']
+        if fn is None:
             print("✗ GetLogicalDriveStrings函数不存在")
-        except Exception as e:
-            print(f"✗ GetLogicalDriveStrings调用失败: {e}")
+        else:
+            try:
+                drive_list = fn().rstrip('\x00').split('\x00')
+                print(f"✓ GetLogicalDriveStrings: {drive_list}")
+            except Exception as e:
+                print(f"✗ GetLogicalDriveStrings调用失败: {e}")
         
         # 测试GetDriveType
-        try:
-            drive_type = win32api.GetDriveType("C:\\")
-            print(f"✓ GetDriveType: {drive_type}")
-        except AttributeError:
+        fn = _W32['GetDriveType']
+        if fn is None:
             print("✗ GetDriveType函数不存在")
-        except Exception as e:
-            print(f"✗ GetDriveType调用失败: {e}")
+        else:
+            try:
+                print(f"✓ GetDriveType: {fn(TEST_DRIVE_ROOT)}")
+            except Exception as e:
+                print(f"✗ GetDriveType调用失败: {e}")
         
         # 测试GetVolumeInformation
-        try:
-            volume_info = win32api.GetVolumeInformation("C:\\")
-            print(f"✓ GetVolumeInformation: {volume_info[0] if volume_info else 'None'}")
-        except AttributeError:
+        fn = _W32['GetVolumeInformation']
+        if fn is None:
             print("✗ GetVolumeInformation函数不存在")
-        except Exception as e:
-            print(f"✗ GetVolumeInformation调用失败: {e}")
-            
-    except ImportError as e:
-        print(f"✗ win32api模块导入失败: {e}")
+        else:
+            try:
+                volume_info = fn(TEST_DRIVE_ROOT)
+                print(f"✓ GetVolumeInformation: {volume_info[0] if volume_info else 'None'}")
+            except Exception as e:
+                print(f"✗ GetVolumeInformation调用失败: {e}")
     
     print()
     
     # 测试win32file
-    try:
-        import win32file
+    if win32file is None:
+        print(f"✗ win32file模块导入失败: {_WIN32FILE_IMPORT_ERROR}")
+    else:
         print("✓ win32file模块导入成功")
         
         # 测试GetDiskFreeSpaceEx
-        try:
-            free_space = win32file.GetDiskFreeSpaceEx("C:\\")
-            print(f"✓ GetDiskFreeSpaceEx: {free_space[:2]}")
-        except AttributeError:
+        fn = _W32FILE['GetDiskFreeSpaceEx']
+        if fn is None:
             print("✗ GetDiskFreeSpaceEx函数不存在")
-        except Exception as e:
-            print(f"✗ GetDiskFreeSpaceEx调用失败: {e}")
+        else:
+            try:
+                print(f"✓ GetDiskFreeSpaceEx: {fn(TEST_DRIVE_ROOT)[:2]}")
+            except Exception as e:
+                print(f"✗ GetDiskFreeSpaceEx调用失败: {e}")
         
         # 测试GetDriveType
-        try:
-            drive_type = win32file.GetDriveType("C:\\")
-            print(f"✓ win32file.GetDriveType: {drive_type}")
-        except AttributeError:
+        fn = _W32FILE['GetDriveType']
+        if fn is None:
             print("✗ win32file.GetDriveType函数不存在")
-        except Exception as e:
-            print(f"✗ win32file.GetDriveType调用失败: {e}")
-            
-    except ImportError as e:
-        print(f"✗ win32file模块导入失败: {e}")
+        else:
+            try:
+                print(f"✓ win32file.GetDriveType: {fn(TEST_DRIVE_ROOT)}")
+            except Exception as e:
+                print(f"✗ win32file.GetDriveType调用失败: {e}")
     
     print()
     
     # 列出win32api的所有属性
-    try:
-        import win32api
+    if win32api is not None:
         print("win32api模块的属性:")
         attrs = [attr for attr in dir(win32api) if not attr.startswith('_')]
         for attr in sorted(attrs):
             print(f"  - {attr}")
-    except:
-        pass
 
 if __name__ == "__main__":
-    test_win32_modules()
\ No newline at end of file
+    test_win32_modules()
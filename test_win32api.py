@@ -14,7 +14,8 @@ def test_win32api_import():
         # 测试基本功能
         try:
             drives = win32api.GetLogicalDriveStrings()
-            print(f"✓ 获取逻辑驱动器成功: {drives.split(chr(0))[:-1]}")
+            drive_list = drives.rstrip('\x00').split('\x00')
+            print(f"✓ 获取逻辑驱动器成功: {drive_list}")
         except Exception as e:
             print(f"✗ 获取逻辑驱动器失败: {e}")
             
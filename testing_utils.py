@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试脚本共用的辅助函数
+"""
+
+import atexit
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+class _ThreadRoutedStdout:
+    """把各线程的输出写入该线程登记的缓冲区，未登记的线程写到原始输出"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def _target(self):
+        buffer = getattr(self.local, 'buffer', None)
+        return self.stream if buffer is None else buffer
+    
+    def write(self, text):
+        return self._target().write(text)
+    
+    def flush(self):
+        self._target().flush()
+    
+    def __getattr__(self, name):
+        # encoding、isatty()、fileno()等其余属性转给当前线程的目标流
+        return getattr(self._target(), name)
+
+def run_tests_concurrently(tests):
+    """在线程池中并行运行测试函数，返回与tests顺序一致的结果列表
+    
+    每个测试的输出写入自己的StringIO，全部结束后按tests中的顺序依次输出，
+    因此控制台上的输出顺序与各测试的完成先后无关
+    """
+    router = _ThreadRoutedStdout(sys.stdout)
+    
+    def run(test):
+        buffer = io.StringIO()
+        router.local.buffer = buffer
+        try:
+            result = test()
+        except Exception:
+            traceback.print_exc(file=buffer)
+            result = False
+        finally:
+            router.local.buffer = None
+        return result, buffer.getvalue()
+    
+    # redirect_stdout替换的是进程级的sys.stdout，各线程共用一个按线程分发的对象，
+    # 只在线程池运行期间生效
+    with contextlib.redirect_stdout(router):
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            outcomes = list(executor.map(run, tests))
+    
+    results = []
+    for result, text in outcomes:
+        sys.stdout.write(text)
+        results.append(result)
+    sys.stdout.flush()
+    return results
+
+@lru_cache(maxsize=1)
+def create_test_image():
+    """创建一个包含测试文件的镜像（每个进程只创建一次，退出时删除）"""
+    # 创建临时镜像文件
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.img') as temp_file:
+        image_path = temp_file.name
+        
+        # 写入一些测试数据和文件签名
+        # JPEG文件签名
+        jpeg_header = bytes.fromhex('FFD8FFE0')
+        jpeg_data = jpeg_header + b'\x00' * 1000  # 模拟JPEG文件
+        
+        # PNG文件签名
+        png_header = bytes.fromhex('89504E470D0A1A0A')
+        png_data = png_header + b'\x00' * 1000  # 模拟PNG文件
+        
+        # PDF文件签名
+        pdf_header = b'%PDF-1.4'
+        pdf_data = pdf_header + b'\x00' * 1000  # 模拟PDF文件
+        
+        # 一次性分配整个镜像（文件之间各有1KB零填充），再整体写入
+        padding = 1024
+        total_size = 4 * padding + len(jpeg_data) + len(png_data) + len(pdf_data)
+        image = bytearray(total_size)
+        view = memoryview(image)
+        
+        offset = padding
+        for file_data in (jpeg_data, png_data, pdf_data):
+            view[offset:offset + len(file_data)] = file_data
+            offset += len(file_data) + padding
+        
+        temp_file.write(image)
+    
+    atexit.register(_remove_test_image, image_path)
+    return image_path
+
+def _remove_test_image(image_path):
+    """删除测试镜像"""
+    try:
+        os.unlink(image_path)
+        print(f"\n已删除测试镜像: {image_path}")
+    except OSError:
+        pass
+
+def warm_cache(path):
+    """提示系统预读镜像文件到页缓存，使首次扫描不必等待磁盘
+    
+    只在支持posix_fadvise的平台上生效；其他平台不预读，
+    以免后台读取与恢复扫描同时读同一文件，反而加倍I/O
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        # 长度为0表示到文件末尾，内核异步预读
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
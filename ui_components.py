@@ -2,71 +2,291 @@
 # -*- coding: utf-8 -*-
 
 from PyQt5.QtWidgets import (
-    QTextEdit, QTreeWidget, QTreeWidgetItem, QHeaderView, QWidget, 
+    QTextEdit, QPlainTextEdit, QTreeWidget, QTreeWidgetItem, QHeaderView, QWidget, 
     QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QSplitter,
     QPushButton, QComboBox, QCheckBox, QFileDialog, QMessageBox,
     QTabWidget, QGroupBox, QRadioButton, QSpinBox, QLineEdit,
-    QFormLayout, QDialog, QDialogButtonBox, QApplication
+    QFormLayout, QDialog, QDialogButtonBox, QApplication, QScrollBar
 )
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QTimer
 from PyQt5.QtGui import QFont, QColor, QTextCursor, QIcon, QPixmap
 import os
 import platform
+import sys
 import threading
 import traceback
+from collections import OrderedDict
 
-class HexViewer(QTextEdit):
+# ASCII列转换表：可打印字符保持不变，其余字节显示为'.'
+_ASCII_TBL = bytes(b if 32 <= b <= 126 else 0x2E for b in range(256))
+
+# 0x00-0xFF的两位十六进制文本表，拼接地址时查表，无需逐次格式化
+_ADDR_HEX = tuple(f"{b:02X}" for b in range(256))
+
+def _format_hex_bytes(chunk):
+    """格式化十六进制列（字节间以空格分隔）"""
+    return chunk.hex(' ').upper()
+
+def _format_address(addr):
+    """格式化8位十六进制地址，超出32位时退回常规格式化"""
+    if addr > 0xFFFFFFFF:
+        return f"{addr:08X}"
+    return (_ADDR_HEX[(addr >> 24) & 0xFF] + _ADDR_HEX[(addr >> 16) & 0xFF] +
+            _ADDR_HEX[(addr >> 8) & 0xFF] + _ADDR_HEX[addr & 0xFF])
+
+def format_hex_dump(data, base_offset, bytes_per_line=16):
+    """把一段数据格式化为十六进制转储行（每行以换行结尾）的列表
+    
+    十六进制列和ASCII列各用一次C层调用处理整段数据，再按行切片
+    """
+    # 末尾补一个分隔空格，每个完整行的十六进制列正好是定长切片，无需再补齐
+    hex_width = bytes_per_line * 3
+    hex_text = _format_hex_bytes(data) + " "
+    ascii_text = bytes(data).translate(_ASCII_TBL).decode('ascii')
+    
+    lines = [
+        f"{_format_address(base_offset + i)}: {hex_text[i * 3:i * 3 + hex_width]} {ascii_text[i:i + bytes_per_line]}\n"
+        for i in range(0, len(data), bytes_per_line)
+    ]
+    
+    # 只有最后一行可能不完整，单独补齐十六进制列
+    tail = len(data) % bytes_per_line
+    if tail:
+        i = len(data) - tail
+        lines[-1] = f"{_format_address(base_offset + i)}: {hex_text[i * 3:].ljust(hex_width)} {ascii_text[i:]}\n"
+    return lines
+
+# 对话框按钮样式：通过buttonStyle属性选择，安装到QApplication上只解析一次
+_BUTTON_QSS = """
+    QDialogButtonBox[buttonStyle="primary"] QPushButton,
+    QDialogButtonBox[buttonStyle="secondary"] QPushButton,
+    QPushButton[buttonStyle="primary"] {
+        background-color: #3498db;
+        color: white;
+        border: none;
+        padding: 10px 20px;
+        border-radius: 5px;
+        font-family: "Microsoft YaHei", "SimHei", "黑体";
+        font-weight: bold;
+        font-size: 14px;
+        min-width: 80px;
+        min-height: 30px;
+    }
+    QDialogButtonBox[buttonStyle="primary"] QPushButton:hover,
+    QPushButton[buttonStyle="primary"]:hover {
+        background-color: #2980b9;
+    }
+    QDialogButtonBox[buttonStyle="primary"] QPushButton:pressed,
+    QPushButton[buttonStyle="primary"]:pressed {
+        background-color: #21618c;
+    }
+    QDialogButtonBox[buttonStyle="secondary"] QPushButton,
+    QDialogButtonBox[buttonStyle="primary"] QPushButton[text="Cancel"],
+    QDialogButtonBox[buttonStyle="primary"] QPushButton[text="取消"] {
+        background-color: #95a5a6;
+    }
+    QDialogButtonBox[buttonStyle="secondary"] QPushButton:hover,
+    QDialogButtonBox[buttonStyle="primary"] QPushButton[text="Cancel"]:hover,
+    QDialogButtonBox[buttonStyle="primary"] QPushButton[text="取消"]:hover {
+        background-color: #7f8c8d;
+    }
+    QDialogButtonBox[buttonStyle="secondary"] QPushButton:pressed,
+    QDialogButtonBox[buttonStyle="primary"] QPushButton[text="Cancel"]:pressed,
+    QDialogButtonBox[buttonStyle="primary"] QPushButton[text="取消"]:pressed {
+        background-color: #6c7b7d;
+    }
+"""
+
+def install_button_styles(app=None):
+    """把对话框按钮样式追加到应用样式表（每个QApplication只安装一次）"""
+    app = app or QApplication.instance()
+    if app is None or app.property("buttonStylesInstalled"):
+        return
+    app.setStyleSheet(app.styleSheet() + _BUTTON_QSS)
+    app.setProperty("buttonStylesInstalled", True)
+
+# HexViewer无数据时显示的提示
+_EMPTY_MSG = "无数据可显示"
+
+# DiskInfoPanel属性/值行模板（绑定的format_map，模板只解析一次）
+_ROW_TPL = "<tr bgcolor='{bg}'><td>{k}</td><td>{v}</td></tr>".format_map
+
+class HexViewer(QPlainTextEdit):
     """十六进制查看器组件"""
     
+    # 已格式化行缓存的最大行数
+    LINE_CACHE_SIZE = 4096
+    # 顺序读取时预读后续数据的倍数及上限
+    PREFETCH_FACTOR = 4
+    PREFETCH_LIMIT = 1024 * 1024
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setReadOnly(True)
         self.setFont(QFont('Courier New', 10))
-        self.setLineWrapMode(QTextEdit.NoWrap)
-        self.current_offset = 0
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.current_offset = 0  # 视图首行对应的地址
+        self.base_offset = 0  # data[0]对应的地址
         self.bytes_per_line = 16
         self.total_size = 0
         self.data = b''
+        self._line_cache = OrderedDict()  # 行起始地址 -> 格式化好的行文本（LRU）
+        self._formatted_for = None  # 当前文本对应的 (首行地址, 每页行数)
+        self._last_read = None  # 上一次磁盘读取 (disk_path, offset, size)
+        self._prefetch = None  # 预读数据 (disk_path, 起始偏移, 数据)，由预读线程填充
+        self._prefetch_thread = None
+        self._wheel_delta = 0  # 触控板/高精度滚轮未满一格（120）的累计滚动量
+        
+        # 只格式化可见行：关闭内置滚动条，由按行计数的独立滚动条驱动视图
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.line_scroll_bar = QScrollBar(Qt.Vertical, self)
+        self.line_scroll_bar.valueChanged.connect(self._on_line_scrolled)
+        self.setViewportMargins(0, 0, self.line_scroll_bar.sizeHint().width(), 0)
+        self._update_lines_per_page()  # 每页行数，尺寸变化时更新
     
     def set_data(self, data, offset=0):
         """设置要显示的数据"""
-        self.data = data
+        # 以只读memoryview保存，update_view中按行切片不再复制数据
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+        self.data = memoryview(data).toreadonly()
         self.total_size = len(data)
+        self.base_offset = offset
         self.current_offset = offset
+        self._line_cache.clear()
+        self._formatted_for = None
+        
+        # 重置滚动条，不触发重复刷新
+        self.line_scroll_bar.blockSignals(True)
+        self._update_scroll_range()
+        self.line_scroll_bar.setValue(0)
+        self.line_scroll_bar.blockSignals(False)
         self.update_view()
     
+    def _update_lines_per_page(self):
+        """按视口高度和实际字体行高计算每页完整显示的行数"""
+        self._lines_per_page = max(1, self.viewport().height() // self.fontMetrics().lineSpacing())
+    
+    def _update_scroll_range(self):
+        """按总行数和可见行数设置滚动条范围"""
+        total_lines = (self.total_size + self.bytes_per_line - 1) // self.bytes_per_line
+        visible_lines = self._lines_per_page + 1  # 含最后一个不完整行
+        self.line_scroll_bar.setRange(0, max(0, total_lines - visible_lines + 1))
+        self.line_scroll_bar.setPageStep(visible_lines)
+    
+    def _on_line_scrolled(self, value):
+        """滚动条移动时只重新格式化新的可见行"""
+        self.current_offset = self.base_offset + value * self.bytes_per_line
+        self.update_view()
+    
+    def resizeEvent(self, event):
+        """调整大小时重新放置滚动条并刷新可见行"""
+        super().resizeEvent(event)
+        rect = self.contentsRect()
+        width = self.line_scroll_bar.sizeHint().width()
+        height = rect.height()
+        if self.horizontalScrollBar().isVisible():
+            height -= self.horizontalScrollBar().height()
+        self.line_scroll_bar.setGeometry(rect.right() - width + 1, rect.top(), width, height)
+        self._update_lines_per_page()
+        self._update_scroll_range()
+        self.update_view()
+    
+    def wheelEvent(self, event):
+        """滚轮按行滚动"""
+        # 小幅度滚动累计到满一格再滚动；向零取整，正负方向对称
+        delta = self._wheel_delta + event.angleDelta().y()
+        steps = int(delta / 120)
+        self._wheel_delta = delta - steps * 120
+        if steps:
+            bar = self.line_scroll_bar
+            bar.setValue(bar.value() - steps * QApplication.wheelScrollLines())
+        event.accept()
+    
+    def keyPressEvent(self, event):
+        """方向键和翻页键按行滚动"""
+        directions = {
+            Qt.Key_Up: "up",
+            Qt.Key_Down: "down",
+            Qt.Key_PageUp: "page_up",
+            Qt.Key_PageDown: "page_down"
+        }
+        direction = directions.get(event.key())
+        if direction:
+            self.navigate(direction)
+        else:
+            super().keyPressEvent(event)
+    
     def load_data_from_disk(self, disk_path, offset, size=1024):
         """从磁盘加载数据"""
         try:
-            from disk_utils import DiskManager
-            
-            disk_manager = DiskManager()
-            
-            # 计算起始扇区和扇区数
-            start_sector = offset // 512
-            sector_count = (size + 511) // 512  # 向上取整
-            
-            # 读取扇区数据
-            data = disk_manager.read_sectors(disk_path, start_sector, sector_count)
+            # 优先使用预读的数据
+            data = self._take_prefetched(disk_path, offset, size)
+            if data is None:
+                data = self._read_disk_range(disk_path, offset, size)
             
-            # 检查返回的数据类型
-            if not isinstance(data, (bytes, bytearray)):
-                raise Exception(f"读取数据类型错误: 期望bytes，实际得到{type(data)}")
-            
-            # 如果偏移量不是扇区对齐的，需要调整数据
-            sector_offset = offset % 512
-            if sector_offset > 0:
-                data = data[sector_offset:]
-            
-            # 截取到指定大小
-            if len(data) > size:
-                data = data[:size]
+            # 检测到顺序读取时，在后台预读后续数据
+            if self._last_read == (disk_path, offset - size, size):
+                self._start_prefetch(disk_path, offset + size, size)
+            self._last_read = (disk_path, offset, size)
             
             self.set_data(data, offset)
                 
         except Exception as e:
             error_msg = f"读取磁盘数据失败: {str(e)}"
-            self.setText(error_msg)
+            self.setPlainText(error_msg)
+            self._formatted_for = None
+    
+    def _read_disk_range(self, disk_path, offset, size):
+        """读取磁盘上从offset开始的size字节"""
+        from disk_utils import DiskManager
+        
+        disk_manager = DiskManager()
+        
+        # 计算起始扇区和扇区数（非扇区对齐的偏移量需要多读覆盖到结尾）
+        start_sector = offset // 512
+        sector_offset = offset % 512
+        sector_count = (sector_offset + size + 511) // 512  # 向上取整
+        
+        # 直接读入预先分配的缓冲区
+        buffer = bytearray(sector_count * 512)
+        read_size = disk_manager.read_sectors_into(disk_path, start_sector, sector_count, buffer)
+        
+        # 用memoryview截取所需范围，不复制数据
+        return memoryview(buffer)[sector_offset:min(read_size, sector_offset + size)]
+    
+    def _take_prefetched(self, disk_path, offset, size):
+        """从预读数据中取出所需范围，未命中时返回None"""
+        prefetch = self._prefetch
+        if prefetch is None or prefetch[0] != disk_path:
+            return None
+        
+        start = offset - prefetch[1]
+        data = prefetch[2]
+        if start < 0 or start + size > len(data):
+            return None
+        return data[start:start + size]
+    
+    def _start_prefetch(self, disk_path, offset, size):
+        """后台预读offset之后的若干块数据"""
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+        
+        if self._take_prefetched(disk_path, offset, size) is not None:
+            return  # 下一块已经预读过
+        
+        prefetch_size = min(size * self.PREFETCH_FACTOR, self.PREFETCH_LIMIT)
+        if prefetch_size < size:
+            return  # 单次读取已超过预读上限
+        
+        def prefetch():
+            try:
+                self._prefetch = (disk_path, offset, self._read_disk_range(disk_path, offset, prefetch_size))
+            except Exception:
+                pass  # 预读失败不影响正常读取
+        
+        self._prefetch_thread = threading.Thread(target=prefetch, daemon=True)
+        self._prefetch_thread.start()
     
     def _create_sample_disk_data(self, disk_path, offset, size):
         """创建示例磁盘数据"""
@@ -82,69 +302,69 @@ class HexViewer(QTextEdit):
             info_text = f"Disk: {disk_path} at offset {offset:08X}".encode('ascii')
             sample_data[100:100+len(info_text)] = info_text
         else:
-            # 其他偏移量的模拟数据
-            sample_data = bytearray(size)
-            for i in range(0, size, 16):
-                # 创建有规律的数据模式
-                pattern = f"OFFSET_{offset+i:08X}".encode('ascii')
-                end_pos = min(i + len(pattern), size)
-                sample_data[i:end_pos] = pattern[:end_pos-i]
+            # 其他偏移量的模拟数据：每16字节一个有规律的数据模式，拼接后一次编码
+            sample_data = "".join(
+                f"OFFSET_{_format_address(offset + i)}"[:16].ljust(16, "\0")
+                for i in range(0, size, 16)
+            ).encode('ascii')[:size]
         
         self.set_data(bytes(sample_data), offset)
     
     def update_view(self):
         """更新视图"""
-        if not self.data:
-            self.setText("无数据可显示")
+        if len(self.data) == 0:
+            # 反复刷新空视图时不重建文本
+            if self.toPlainText() != _EMPTY_MSG:
+                self.setPlainText(_EMPTY_MSG)
             return
         
-        text = ""
-        for i in range(0, len(self.data), self.bytes_per_line):
-            # 地址列
-            addr = self.current_offset + i
-            text += f"{addr:08X}: "
-            
-            # 十六进制列
-            hex_part = ""
-            for j in range(self.bytes_per_line):
-                if i + j < len(self.data):
-                    hex_part += f"{self.data[i+j]:02X} "
-                else:
-                    hex_part += "   "
-            text += hex_part.ljust(self.bytes_per_line * 3)
-            
-            # ASCII列
-            ascii_part = ""
-            for j in range(self.bytes_per_line):
-                if i + j < len(self.data):
-                    byte = self.data[i+j]
-                    if 32 <= byte <= 126:  # 可打印ASCII字符
-                        ascii_part += chr(byte)
-                    else:
-                        ascii_part += "."
-            text += " " + ascii_part + "\n"
-        
-        self.setText(text)
+        # 首行和可见行数都没变时（如只改变了宽度）文本无需重建
+        view_key = (self.current_offset, self._lines_per_page)
+        if view_key == self._formatted_for:
+            return
+        
+        # 只格式化从当前行开始、视口能显示的部分
+        start = self.current_offset - self.base_offset
+        end = min(len(self.data), start + (self._lines_per_page + 1) * self.bytes_per_line)
+        
+        bytes_per_line = self.bytes_per_line
+        addrs = range(self.base_offset + start, self.base_offset + end, bytes_per_line)
+        line_cache = self._line_cache
+        
+        # 逐行滚动时大部分行与上次相同，只把缓存中缺失的连续区间一次格式化
+        missing = [k for k, addr in enumerate(addrs) if addr not in line_cache]
+        if missing:
+            first, last = missing[0], missing[-1] + 1
+            chunk = self.data[start + first * bytes_per_line:min(end, start + last * bytes_per_line)]
+            for addr, line in zip(addrs[first:last], format_hex_dump(chunk, addrs[first], bytes_per_line)):
+                line_cache[addr] = line
+        
+        lines = []
+        for addr in addrs:
+            line_cache.move_to_end(addr)
+            lines.append(line_cache[addr])
+        while len(line_cache) > self.LINE_CACHE_SIZE:
+            line_cache.popitem(last=False)
+        
+        text = "".join(lines)
+        self.setPlainText(text)
+        self._formatted_for = view_key
     
     def set_offset(self, offset):
-        """设置当前偏移量"""
-        self.current_offset = offset
-        self.update_view()
+        """设置当前偏移量（滚动到该地址所在行）"""
+        self.line_scroll_bar.setValue((offset - self.base_offset) // self.bytes_per_line)
     
     def navigate(self, direction):
         """导航数据（上/下/页上/页下）"""
+        bar = self.line_scroll_bar
         if direction == "up":
-            self.current_offset = max(0, self.current_offset - self.bytes_per_line)
+            bar.setValue(bar.value() - 1)
         elif direction == "down":
-            self.current_offset = min(self.total_size - 1, self.current_offset + self.bytes_per_line)
+            bar.setValue(bar.value() + 1)
         elif direction == "page_up":
-            lines_per_page = self.height() // 20  # 估计每页行数
-            self.current_offset = max(0, self.current_offset - lines_per_page * self.bytes_per_line)
+            bar.setValue(bar.value() - self._lines_per_page)
         elif direction == "page_down":
-            lines_per_page = self.height() // 20  # 估计每页行数
-            self.current_offset = min(self.total_size - 1, self.current_offset + lines_per_page * self.bytes_per_line)
-        
-        self.update_view()
+            bar.setValue(bar.value() + self._lines_per_page)
 
 class FileSystemTree(QTreeWidget):
     """文件系统树组件"""
@@ -161,7 +381,6 @@ class FileSystemTree(QTreeWidget):
         self.setAnimated(True)
         self.itemDoubleClicked.connect(self.on_item_double_clicked)
         self.itemClicked.connect(self.on_item_clicked)  # 连接单击事件
-        self.items_data = {}  # 存储项目关联的数据
         
         # 优化显示效果，减少行高和间距
         self.setIndentation(15)  # 减少缩进
@@ -181,34 +400,42 @@ class FileSystemTree(QTreeWidget):
     
     def add_item(self, parent, name, size="", item_type="", attributes="", item_data=None):
         """添加项目到树"""
-        item = QTreeWidgetItem(parent if parent else self)
+        item = self._create_item(name, size, item_type, attributes, item_data)
+        if parent:
+            parent.addChild(item)
+        else:
+            self.addTopLevelItem(item)
+        return item
+    
+    def _create_item(self, name, size="", item_type="", attributes="", item_data=None):
+        """创建尚未挂到树上的项目，便于整层批量插入"""
+        item = QTreeWidgetItem()
         item.setText(0, name)
         item.setText(1, size)
         item.setText(2, item_type)
         item.setText(3, attributes)
         
-        # 存储项目关联的数据
+        # 项目关联的数据直接存放在项目自身
         if item_data:
-            self.items_data[id(item)] = item_data
+            item.setData(0, Qt.UserRole, item_data)
         
         return item
     
     def clear_tree(self):
         """清空树"""
         self.clear()
-        self.items_data = {}
     
     def on_item_double_clicked(self, item, column):
         """处理项目双击事件"""
-        item_id = id(item)
-        if item_id in self.items_data:
-            self.item_double_clicked.emit(self.items_data[item_id])
+        item_data = item.data(0, Qt.UserRole)
+        if item_data is not None:
+            self.item_double_clicked.emit(item_data)
     
     def on_item_clicked(self, item, column):
         """处理项目单击事件"""
-        item_id = id(item)
-        if item_id in self.items_data:
-            self.item_clicked.emit(self.items_data[item_id])
+        item_data = item.data(0, Qt.UserRole)
+        if item_data is not None:
+            self.item_clicked.emit(item_data)
     
     def load_disk(self, disk_path):
         """加载磁盘文件系统"""
@@ -218,8 +445,13 @@ class FileSystemTree(QTreeWidget):
             self.clear_tree()
             disk_manager = DiskManager()
             
+            # 构建期间暂停重绘和信号，各层项目建好后一次性插入
+            self.setUpdatesEnabled(False)
+            self.blockSignals(True)
+            
             # 添加根节点
             root_item = self.add_item(None, f"磁盘: {disk_path}", "", "磁盘", "")
+            root_children = []
             
             # 获取磁盘信息
             disk_info = disk_manager.get_disk_info(disk_path)
@@ -229,16 +461,12 @@ class FileSystemTree(QTreeWidget):
             
             if not is_logical_drive:
                 # 对于物理磁盘或虚拟磁盘文件，添加MBR项目
-                mbr_item = self.add_item(root_item, "主引导记录 (MBR)", "512 字节", "系统", "只读",
-                                       {"disk_path": disk_path, "offset": 0, "size": 512, "type": "mbr"})
+                root_children.append(self._create_item("主引导记录 (MBR)", "512 字节", "系统", "只读",
+                                                       {"disk_path": disk_path, "offset": 0, "size": 512, "type": "mbr"}))
             
             # 如果有分区信息，添加分区项目
             if 'partitions' in disk_info and disk_info['partitions']:
-                if not is_logical_drive:
-                    partitions_item = self.add_item(root_item, "分区", "", "文件夹", "")
-                else:
-                    partitions_item = root_item  # 对于逻辑驱动器，直接在根节点下添加
-                
+                part_items = []
                 for i, partition in enumerate(disk_info['partitions']):
                     if partition['type'] != 0:  # 跳过空分区
                         if is_logical_drive:
@@ -251,9 +479,18 @@ class FileSystemTree(QTreeWidget):
                         # 计算DBR偏移量（分区起始扇区）
                         dbr_offset = partition['start_sector'] * 512
                         
-                        part_item = self.add_item(partitions_item, part_name, part_size, "分区", "",
-                                                 {"disk_path": disk_path, "offset": dbr_offset, 
-                                                  "size": 512, "type": "dbr", "partition_info": partition})
+                        part_items.append(self._create_item(part_name, part_size, "分区", "",
+                                                            {"disk_path": disk_path, "offset": dbr_offset, 
+                                                             "size": 512, "type": "dbr", "partition_info": partition}))
+                
+                if not is_logical_drive:
+                    partitions_item = self._create_item("分区", "", "文件夹", "")
+                    partitions_item.addChildren(part_items)
+                    root_children.append(partitions_item)
+                else:
+                    root_children.extend(part_items)  # 对于逻辑驱动器，直接在根节点下添加
+            
+            root_item.addChildren(root_children)
             
             # 展开根节点
             root_item.setExpanded(True)
@@ -262,6 +499,9 @@ class FileSystemTree(QTreeWidget):
             # 如果加载失败，显示错误信息
             error_item = self.add_item(None, f"加载失败: {str(e)}", "", "错误", "")
             error_item.setExpanded(True)
+        finally:
+            self.blockSignals(False)
+            self.setUpdatesEnabled(True)
 
 class DiskInfoPanel(QWidget):
     """磁盘信息面板组件"""
@@ -285,20 +525,21 @@ class DiskInfoPanel(QWidget):
             self.info_text.setHtml("<p>无可用信息</p>")
             return
         
-        html = "<table border='0' cellspacing='2' cellpadding='4' width='100%'>"
+        parts = ["<table border='0' cellspacing='2' cellpadding='4' width='100%'>"]
+        append = parts.append
         
         # 处理错误信息
         if 'error' in info_dict:
-            html += f"<tr><td colspan='2' style='color:red;'>{info_dict['error']}</td></tr>"
-            html += "</table>"
-            self.info_text.setHtml(html)
+            append(f"<tr><td colspan='2' style='color:red;'>{info_dict['error']}</td></tr>")
+            append("</table>")
+            self.info_text.setHtml("".join(parts))
             return
         
         # 添加表头
-        html += "<tr bgcolor='#E0E0E0'><th align='left'>属性</th><th align='left'>值</th></tr>"
+        append("<tr bgcolor='#E0E0E0'><th align='left'>属性</th><th align='left'>值</th></tr>")
         
         # 添加信息行
-        row_class = ['#F8F8F8', '#FFFFFF']
+        row_class = ('#F8F8F8', '#FFFFFF')
         row_index = 0
         
         # 处理特殊键
@@ -306,7 +547,7 @@ class DiskInfoPanel(QWidget):
         
         # 首先处理文件系统类型（如果有）
         if 'filesystem' in info_dict:
-            html += f"<tr bgcolor='{row_class[row_index % 2]}'><td><b>文件系统</b></td><td>{info_dict['filesystem']}</td></tr>"
+            append(_ROW_TPL({"bg": row_class[row_index & 1], "k": "<b>文件系统</b>", "v": info_dict['filesystem']}))
             row_index += 1
         
         # 处理常规键值对
@@ -318,55 +559,63 @@ class DiskInfoPanel(QWidget):
             key_name = key.replace('_', ' ').title()
             
             # 添加行
-            html += f"<tr bgcolor='{row_class[row_index % 2]}'><td>{key_name}</td><td>{value}</td></tr>"
+            append(_ROW_TPL({"bg": row_class[row_index & 1], "k": key_name, "v": value}))
             row_index += 1
         
         # 处理分区信息
         if 'partitions' in info_dict and info_dict['partitions']:
-            html += f"<tr bgcolor='#E0E0E0'><th colspan='2' align='left'>分区信息</th></tr>"
+            append("<tr bgcolor='#E0E0E0'><th colspan='2' align='left'>分区信息</th></tr>")
             
             for partition in info_dict['partitions']:
-                html += f"<tr bgcolor='{row_class[row_index % 2]}'><td colspan='2'>"
-                html += "<table border='0' cellspacing='1' cellpadding='2' width='100%'>"
-                html += f"<tr><td><b>分区 {partition.get('index', '')}</b></td><td>{partition.get('type_name', '')}</td></tr>"
-                html += f"<tr><td>状态</td><td>{partition.get('status', '')}</td></tr>"
-                html += f"<tr><td>起始扇区</td><td>{partition.get('start_lba', '')}</td></tr>"
-                html += f"<tr><td>扇区数</td><td>{partition.get('sectors', '')}</td></tr>"
-                html += f"<tr><td>大小</td><td>{partition.get('size_human', '')}</td></tr>"
-                html += "</table>"
-                html += "</td></tr>"
+                # 每个分区的字段只取一次
+                get = partition.get
+                index, type_name, status = get('index', ''), get('type_name', ''), get('status', '')
+                start_lba, sectors, size_human = get('start_lba', ''), get('sectors', ''), get('size_human', '')
+                
+                # 每个分区的整行一次格式化，键值对放在一个<pre>块中，不再嵌套表格
+                append(
+                    f"<tr bgcolor='{row_class[row_index & 1]}'><td colspan='2'>"
+                    "<pre style='margin:0'>"
+                    f"<b>分区 {index}</b>: {type_name}\n"
+                    f"状态: {status}\n"
+                    f"起始扇区: {start_lba}\n"
+                    f"扇区数: {sectors}\n"
+                    f"大小: {size_human}"
+                    "</pre>"
+                    "</td></tr>"
+                )
                 row_index += 1
         
         # 处理扫描结果
         if 'scan_result' in info_dict and 'found_files' in info_dict['scan_result']:
             found_files = info_dict['scan_result']['found_files']
             if found_files:
-                html += f"<tr bgcolor='#E0E0E0'><th colspan='2' align='left'>文件扫描结果</th></tr>"
-                html += f"<tr bgcolor='{row_class[row_index % 2]}'><td colspan='2'>找到 {len(found_files)} 个文件</td></tr>"
+                append("<tr bgcolor='#E0E0E0'><th colspan='2' align='left'>文件扫描结果</th></tr>")
+                append(f"<tr bgcolor='{row_class[row_index & 1]}'><td colspan='2'>找到 {len(found_files)} 个文件</td></tr>")
                 row_index += 1
                 
                 # 按类型统计
                 if 'files_by_type' in info_dict['scan_result']:
                     files_by_type = info_dict['scan_result']['files_by_type']
-                    html += f"<tr bgcolor='{row_class[row_index % 2]}'><td colspan='2'>"
-                    html += "<table border='0' cellspacing='1' cellpadding='2' width='100%'>"
-                    html += "<tr><th>类型</th><th>数量</th></tr>"
+                    append(f"<tr bgcolor='{row_class[row_index & 1]}'><td colspan='2'>")
+                    append("<pre style='margin:0'><b>类型: 数量</b>")
                     
                     for file_type, files in files_by_type.items():
-                        html += f"<tr><td>{file_type}</td><td>{len(files)}</td></tr>"
+                        append(f"\n{file_type}: {len(files)}")
                     
-                    html += "</table>"
-                    html += "</td></tr>"
+                    append("</pre>")
+                    append("</td></tr>")
                     row_index += 1
         
-        html += "</table>"
-        self.info_text.setHtml(html)
+        append("</table>")
+        self.info_text.setHtml("".join(parts))
 
 class ProgressDialog(QDialog):
     """进度对话框组件"""
     
     def __init__(self, title, message, parent=None):
         super().__init__(parent)
+        install_button_styles()  # 启动时未安装时在此补装
         self.setWindowTitle(title)
         self.setMinimumWidth(400)
         
@@ -387,26 +636,7 @@ class ProgressDialog(QDialog):
         
         # 按钮
         button_box = QDialogButtonBox(QDialogButtonBox.Cancel)
-        button_box.setStyleSheet("""
-            QDialogButtonBox QPushButton {
-                background-color: #95a5a6;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-family: "Microsoft YaHei", "SimHei", "黑体";
-                font-weight: bold;
-                font-size: 14px;
-                min-width: 80px;
-                min-height: 30px;
-            }
-            QDialogButtonBox QPushButton:hover {
-                background-color: #7f8c8d;
-            }
-            QDialogButtonBox QPushButton:pressed {
-                background-color: #6c7b7d;
-            }
-        """)
+        button_box.setProperty("buttonStyle", "secondary")
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
         
@@ -434,6 +664,7 @@ class DataWipeDialog(QDialog):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        install_button_styles()  # 启动时未安装时在此补装
         self.setWindowTitle("数据擦除")
         self.setMinimumWidth(500)
         
@@ -484,38 +715,7 @@ class DataWipeDialog(QDialog):
         
         # 按钮
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        button_box.setStyleSheet("""
-            QDialogButtonBox QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-family: "Microsoft YaHei", "SimHei", "黑体";
-                font-weight: bold;
-                font-size: 14px;
-                min-width: 80px;
-                min-height: 30px;
-            }
-            QDialogButtonBox QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QDialogButtonBox QPushButton:pressed {
-                background-color: #21618c;
-            }
-            QDialogButtonBox QPushButton[text="Cancel"],
-            QDialogButtonBox QPushButton[text="取消"] {
-                background-color: #95a5a6;
-            }
-            QDialogButtonBox QPushButton[text="Cancel"]:hover,
-            QDialogButtonBox QPushButton[text="取消"]:hover {
-                background-color: #7f8c8d;
-            }
-            QDialogButtonBox QPushButton[text="Cancel"]:pressed,
-            QDialogButtonBox QPushButton[text="取消"]:pressed {
-                background-color: #6c7b7d;
-            }
-        """)
+        button_box.setProperty("buttonStyle", "primary")
         button_box.accepted.connect(self.validate_and_accept)
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
@@ -565,6 +765,7 @@ class FileRecoveryDialog(QDialog):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        install_button_styles()  # 启动时未安装时在此补装
         self.setWindowTitle("文件恢复")
         self.setMinimumWidth(500)
         
@@ -609,26 +810,7 @@ class FileRecoveryDialog(QDialog):
         self.save_path = QLineEdit()
         self.save_path.setReadOnly(True)
         browse_button = QPushButton("浏览...")
-        browse_button.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-family: "Microsoft YaHei", "SimHei", "黑体";
-                font-weight: bold;
-                font-size: 14px;
-                min-width: 80px;
-                min-height: 30px;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:pressed {
-                background-color: #21618c;
-            }
-        """)
+        browse_button.setProperty("buttonStyle", "primary")
         browse_button.clicked.connect(self.browse_save_path)
         save_path_layout = QHBoxLayout()
         save_path_layout.addWidget(self.save_path)
@@ -640,38 +822,7 @@ class FileRecoveryDialog(QDialog):
         
         # 按钮
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        button_box.setStyleSheet("""
-            QDialogButtonBox QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-family: "Microsoft YaHei", "SimHei", "黑体";
-                font-weight: bold;
-                font-size: 14px;
-                min-width: 80px;
-                min-height: 30px;
-            }
-            QDialogButtonBox QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QDialogButtonBox QPushButton:pressed {
-                background-color: #21618c;
-            }
-            QDialogButtonBox QPushButton[text="Cancel"],
-            QDialogButtonBox QPushButton[text="取消"] {
-                background-color: #95a5a6;
-            }
-            QDialogButtonBox QPushButton[text="Cancel"]:hover,
-            QDialogButtonBox QPushButton[text="取消"]:hover {
-                background-color: #7f8c8d;
-            }
-            QDialogButtonBox QPushButton[text="Cancel"]:pressed,
-            QDialogButtonBox QPushButton[text="取消"]:pressed {
-                background-color: #6c7b7d;
-            }
-        """)
+        button_box.setProperty("buttonStyle", "primary")
         button_box.accepted.connect(self.accept)
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
@@ -1,6 +1,110 @@
+import errno
+import mmap
 import os
+import queue
+import shutil
+import stat
 import struct
-from PyQt5.QtCore import QObject, pyqtSignal
+import subprocess
+import sys
+import threading
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# 内核复制接口对这些文件组合不可用时，退回下一种复制方式
+_KERNEL_COPY_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF}
+
+# Linux块设备大小查询：ioctl(BLKGETSIZE64)返回本机字节序的u64
+_BLKGETSIZE64 = 0x80081272
+_BLKGETSIZE64_RESULT = struct.Struct('=Q')
+
+# create_virtual_partition直接生成的raw镜像类型（'sparse-raw'始终为稀疏文件，忽略preallocate）
+_RAW_IMAGE_TYPES = {'raw', 'sparse-raw'}
+
+# create_virtual_partition经qemu-img转换的镜像类型 -> qemu-img输出格式名
+_QEMU_IMG_FORMATS = {
+    'qcow2': 'qcow2',
+    'vhd': 'vpc',
+    'vhdx': 'vhdx',
+    'vmdk': 'vmdk',
+    'vdi': 'vdi'
+}
+
+# MBR分区表（4个表项）一次解码：每项为 状态, CHS起始, 类型, CHS结束, 起始LBA, 扇区数
+_MBR_TABLE = struct.Struct('<' + 'B3sB3sLL' * 4)
+_MBR_ENTRY_FIELDS = 6
+
+# MBR分区类型代码 -> 名称
+_PARTITION_TYPES = {
+    0x01: 'FAT12',
+    0x04: 'FAT16 (< 32MB)',
+    0x06: 'FAT16',
+    0x07: 'NTFS/HPFS',
+    0x0B: 'FAT32',
+    0x0C: 'FAT32 (LBA)',
+    0x0E: 'FAT16 (LBA)',
+    0x0F: 'Extended (LBA)',
+    0x82: 'Linux Swap',
+    0x83: 'Linux',
+    0x8E: 'Linux LVM',
+    0xEE: 'GPT Protective'
+}
+
+# 引导扇区文件系统签名，按顺序检查：(起始偏移, 结束偏移, 签名, 类型)
+# 签名在[起始, 结束)范围内出现即匹配
+_FS_SIGNATURES = (
+    (3, 11, b'NTFS    ', 'NTFS Partition'),
+    (82, 90, b'FAT32', 'FAT32 Partition'),
+    (54, 59, b'FAT16', 'FAT16 Partition'),
+)
+
+# 引导扇区公共头部（偏移0-35）：跳转指令, OEM标识, 每扇区字节数, 每簇扇区数, 保留扇区数,
+# FAT表数量, 根目录项数, 总扇区数(小值), 媒体描述符, 每FAT扇区数, 每磁道扇区数, 磁头数,
+# 隐藏扇区数, 总扇区数(大值)
+_BOOT_BPB = '<3s8sHBHBHHBHHHLL'
+
+# FAT32引导扇区（偏移0-89）：公共头部 + 每FAT扇区数, 扩展标志, 文件系统版本, 根目录簇号,
+# 文件系统信息扇区, 备份引导扇区, 保留12字节, 驱动器号, 保留, 扩展引导签名, 卷序列号,
+# 卷标, 文件系统类型
+_FAT32_BOOT = struct.Struct(_BOOT_BPB + 'LHHLHH12xBBBL11s8s')
+
+# NTFS扩展BPB中随分区大小变化的字段（偏移40-63）：总扇区数, MFT簇号, MFT镜像簇号
+_NTFS_SIZE_OFFSET = 40
+_NTFS_SIZES = struct.Struct('<QQQ')
+
+def _build_ntfs_boot_template():
+    """构建NTFS引导扇区模板：除_NTFS_SIZES字段外都是固定值"""
+    boot_sector = bytearray(512)
+    
+    struct.pack_into(
+        _BOOT_BPB, boot_sector, 0,
+        b'\xEB\x52\x90',  # 跳转指令
+        b'NTFS    ',  # OEM标识
+        # BPB
+        512,  # 每扇区字节数
+        8,  # 每簇扇区数
+        0,  # 保留扇区数
+        0,  # FAT表数量
+        0,  # 根目录项数
+        0,  # 总扇区数 (小值)
+        0xF8,  # 媒体描述符
+        0,  # 每FAT扇区数
+        63,  # 每磁道扇区数
+        255,  # 磁头数
+        0,  # 隐藏扇区数
+        0  # 总扇区数 (大值)
+    )
+    
+    # 引导签名
+    boot_sector[510:512] = b'\x55\xAA'
+    
+    return bytes(boot_sector)
+
+_NTFS_BOOT_TEMPLATE = _build_ntfs_boot_template()
 
 class VirtualDisk(QObject):
     """虚拟磁盘管理类"""
@@ -8,31 +112,58 @@ class VirtualDisk(QObject):
     progress_updated = pyqtSignal(int)
     status_updated = pyqtSignal(str)
     
+    # 用户态读写每块大小，以及内核内复制（copy_file_range/sendfile）每次调用的大小
+    COPY_CHUNK = 4 * 1024 * 1024
+    KERNEL_COPY_CHUNK = 16 * 1024 * 1024
+    # 读写循环中预读在途的最大块数
+    PIPELINE_DEPTH = 4
+    # 输出文件的写缓冲大小（默认8KB缓冲会把扇区级的小块写入拆成大量系统调用）
+    WRITE_BUFFER_SIZE = 1024 * 1024
+    # 复制镜像时每写出这么多数据，提示内核释放输出文件已写部分的页缓存
+    FADVISE_INTERVAL = 64 * 1024 * 1024
+    
     def __init__(self):
         super().__init__()
+        # 正在运行的后台镜像线程，保持引用直到线程结束
+        self._image_workers = set()
     
     def create_disk_image(self, source_disk, output_path, image_type='raw'):
         """创建磁盘镜像"""
         try:
             self.status_updated.emit(f"正在创建磁盘镜像: {output_path}")
             
+            # 没有进度接收者时整体交给shutil.copyfile，由它选用平台的快速复制路径
+            if not self.receivers(self.progress_updated):
+                shutil.copyfile(source_disk, output_path)
+                self.status_updated.emit(f"磁盘镜像创建完成: {output_path}")
+                return output_path
+            
             with open(source_disk, 'rb') as source:
-                with open(output_path, 'wb') as output:
+                with open(output_path, 'wb', buffering=self.WRITE_BUFFER_SIZE) as output:
                     total_size = self._get_disk_size(source)
                     copied_size = 0
-                    chunk_size = 1024 * 1024  # 1MB chunks
+                    released_size = 0
+                    # 进度百分比下一次变化时的已复制字节数，未到达前不必计算百分比
+                    next_progress_size = 0
                     
-                    while True:
-                        chunk = source.read(chunk_size)
-                        if not chunk:
-                            break
+                    # 顺序流式复制：加大源文件预读，已写出的输出页定期移出页缓存
+                    self._fadvise(source, 'POSIX_FADV_SEQUENTIAL')
+                    
+                    for copied in self._copy_chunks(source, output):
+                        copied_size += copied
                         
-                        output.write(chunk)
-                        copied_size += len(chunk)
+                        if copied_size - released_size >= self.FADVISE_INTERVAL:
+                            self._fadvise(output, 'POSIX_FADV_DONTNEED', released_size, copied_size - released_size)
+                            released_size = copied_size
                         
-                        if total_size > 0:
+                        # 只在百分比变化时发信号，避免大镜像上每块一次的跨线程信号
+                        if total_size > 0 and copied_size >= next_progress_size:
                             progress = min(100, (copied_size * 100) // total_size)
                             self.progress_updated.emit(progress)
+                            if progress < 100:
+                                next_progress_size = -((progress + 1) * total_size // -100)
+                            else:
+                                next_progress_size = float('inf')
                     
                     self.status_updated.emit(f"磁盘镜像创建完成: {output_path}")
                     return output_path
@@ -41,6 +172,102 @@ class VirtualDisk(QObject):
             self.status_updated.emit(f"创建磁盘镜像失败: {str(e)}")
             raise e
     
+    def start_disk_image(self, source_disk, output_path, image_type='raw', on_created=None, on_error=None):
+        """在后台线程中创建磁盘镜像，立即返回已启动的DiskImageWorker
+        
+        进度和状态仍通过progress_updated/status_updated发出，跨线程时由Qt排队投递到接收者所在线程；
+        on_created/on_error在线程启动前连接到image_created/error_occurred，不会错过结果
+        """
+        worker = DiskImageWorker(self, source_disk, output_path, image_type)
+        if on_created is not None:
+            worker.image_created.connect(on_created)
+        if on_error is not None:
+            worker.error_occurred.connect(on_error)
+        self._image_workers.add(worker)
+        worker.finished.connect(self._on_image_worker_finished)
+        worker.start()
+        return worker
+    
+    def _on_image_worker_finished(self):
+        """后台镜像线程结束后释放引用"""
+        worker = self.sender()
+        worker.wait()
+        self._image_workers.discard(worker)
+    
+    def _fadvise(self, file_obj, advice, offset=0, length=0):
+        """向内核提示文件访问方式；平台不支持（如Windows）或文件类型不支持时忽略"""
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        try:
+            os.posix_fadvise(file_obj.fileno(), offset, length, getattr(os, advice))
+        except OSError:
+            pass
+    
+    def _copy_chunks(self, source, output):
+        """把source从当前位置复制到output，逐块产出本次复制的字节数
+        
+        Linux上优先用copy_file_range/sendfile在内核中完成复制，不可用时退回读写循环
+        """
+        if sys.platform.startswith('linux'):
+            in_fd, out_fd = source.fileno(), output.fileno()
+            kernel_copies = []
+            if hasattr(os, 'copy_file_range'):
+                kernel_copies.append(lambda: os.copy_file_range(in_fd, out_fd, self.KERNEL_COPY_CHUNK))
+            if hasattr(os, 'sendfile'):
+                kernel_copies.append(lambda: os.sendfile(out_fd, in_fd, None, self.KERNEL_COPY_CHUNK))
+            
+            for kernel_copy in kernel_copies:
+                try:
+                    copied = kernel_copy()
+                except OSError as e:
+                    if e.errno in _KERNEL_COPY_UNSUPPORTED:
+                        continue  # 第一次调用即失败，尚未复制任何数据，换下一种方式
+                    raise
+                
+                while copied:
+                    yield copied
+                    copied = kernel_copy()
+                return
+        
+        # 读写循环：后台线程预读，写当前块的同时读取后续块
+        for chunk in self._pipelined_read(source):
+            output.write(chunk)
+            yield len(chunk)
+    
+    def _pipelined_read(self, source):
+        """在后台线程中按块读取source，最多PIPELINE_DEPTH块在途，逐块产出"""
+        chunks = queue.Queue(self.PIPELINE_DEPTH)
+        stop = threading.Event()
+        
+        def reader():
+            try:
+                while not stop.is_set():
+                    chunk = source.read(self.COPY_CHUNK)
+                    chunks.put(chunk)
+                    if not chunk:
+                        return
+            except Exception as e:
+                chunks.put(e)
+        
+        thread = threading.Thread(target=reader, daemon=True)
+        thread.start()
+        try:
+            while True:
+                chunk = chunks.get()
+                if isinstance(chunk, Exception):
+                    raise chunk
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            # 提前结束时腾出队列空间，让读线程退出
+            stop.set()
+            while thread.is_alive():
+                try:
+                    chunks.get_nowait()
+                except queue.Empty:
+                    thread.join(0.01)
+    
     def mount_disk_image(self, image_path):
         """挂载磁盘镜像"""
         try:
@@ -60,8 +287,14 @@ class VirtualDisk(QObject):
             self.status_updated.emit(f"挂载磁盘镜像失败: {str(e)}")
             raise e
     
-    def create_virtual_partition(self, size_mb, filesystem='FAT32', output_path=None):
-        """创建虚拟分区"""
+    def create_virtual_partition(self, size_mb, filesystem='FAT32', output_path=None, preallocate=False, image_type='raw'):
+        """创建虚拟分区
+        
+        默认生成稀疏文件，只写入引导扇区等头部结构；preallocate为True时预先分配全部空间。
+        image_type为'raw'或'sparse-raw'时直接生成raw镜像（'sparse-raw'忽略preallocate）；
+        为'qcow2'、'vhd'等格式时先生成稀疏raw镜像再用qemu-img转换（需要已安装qemu-img）；
+        其他值抛出ValueError
+        """
         try:
             if not output_path:
                 output_path = f"virtual_partition_{filesystem.lower()}_{size_mb}mb.img"
@@ -69,15 +302,50 @@ class VirtualDisk(QObject):
             self.status_updated.emit(f"正在创建虚拟分区: {filesystem} ({size_mb}MB)")
             
             size_bytes = size_mb * 1024 * 1024
+            image_format = image_type.lower()
+            if image_format not in _RAW_IMAGE_TYPES and image_format not in _QEMU_IMG_FORMATS:
+                supported = ', '.join(sorted(_RAW_IMAGE_TYPES | _QEMU_IMG_FORMATS.keys()))
+                raise ValueError(f"不支持的镜像类型: {image_type}（支持: {supported}）")
             
-            with open(output_path, 'wb') as f:
-                if filesystem.upper() == 'FAT32':
-                    self._create_fat32_partition(f, size_bytes)
-                elif filesystem.upper() == 'NTFS':
-                    self._create_ntfs_partition(f, size_bytes)
-                else:
-                    # 创建空分区
-                    f.write(b'\x00' * size_bytes)
+            if image_format in _RAW_IMAGE_TYPES:
+                raw_path = output_path
+            else:
+                qemu_img = shutil.which('qemu-img')
+                if not qemu_img:
+                    raise Exception(f"创建{image_type}镜像需要qemu-img，但未找到该程序")
+                raw_path = output_path + '.raw.tmp'
+            
+            try:
+                with open(raw_path, 'wb', buffering=self.WRITE_BUFFER_SIZE) as f:
+                    if filesystem.upper() == 'FAT32':
+                        self._create_fat32_partition(f, size_bytes)
+                    elif filesystem.upper() == 'NTFS':
+                        self._create_ntfs_partition(f, size_bytes)
+                    else:
+                        # 创建空分区
+                        self._extend_to(f, size_bytes)
+                    
+                    if preallocate and image_format == 'raw' and hasattr(os, 'posix_fallocate'):
+                        # 需要完整分配空间时由文件系统一次性分配（Windows上扩展文件本身即分配空间）
+                        f.flush()
+                        os.posix_fallocate(f.fileno(), 0, size_bytes)
+                
+                if raw_path != output_path:
+                    # qemu-img跳过raw镜像中的空洞，转换只处理实际写入的头部数据
+                    result = subprocess.run(
+                        [qemu_img, 'convert', '-f', 'raw', '-O', _QEMU_IMG_FORMATS[image_format],
+                         raw_path, output_path],
+                        capture_output=True, text=True
+                    )
+                    if result.returncode != 0:
+                        raise Exception(f"qemu-img转换失败: {result.stderr.strip()}")
+            finally:
+                # 临时raw镜像与分区一样大，无论成功与否都删除
+                if raw_path != output_path:
+                    try:
+                        os.remove(raw_path)
+                    except FileNotFoundError:
+                        pass
             
             self.status_updated.emit(f"虚拟分区创建完成: {output_path}")
             return output_path
@@ -86,8 +354,26 @@ class VirtualDisk(QObject):
             self.status_updated.emit(f"创建虚拟分区失败: {str(e)}")
             raise e
     
+    def _extend_to(self, file_obj, size_bytes):
+        """把文件扩展到size_bytes，未写入的部分由文件系统按零处理（稀疏文件）"""
+        if file_obj.tell() < size_bytes:
+            file_obj.truncate(size_bytes)
+    
     def _get_disk_size(self, disk_file):
-        """获取磁盘大小"""
+        """获取磁盘大小
+        
+        普通文件直接取fstat的大小，Linux块设备用BLKGETSIZE64查询，其余情况用seek测量
+        """
+        try:
+            fd = disk_file.fileno()
+            st = os.fstat(fd)
+            if stat.S_ISREG(st.st_mode):
+                return st.st_size
+            if fcntl is not None and sys.platform.startswith('linux') and stat.S_ISBLK(st.st_mode):
+                return _BLKGETSIZE64_RESULT.unpack(fcntl.ioctl(fd, _BLKGETSIZE64, bytes(_BLKGETSIZE64_RESULT.size)))[0]
+        except OSError:
+            pass
+        
         try:
             current_pos = disk_file.tell()
             disk_file.seek(0, 2)  # 移动到文件末尾
@@ -107,28 +393,25 @@ class VirtualDisk(QObject):
         }
         
         try:
-            with open(image_path, 'rb') as f:
-                # 读取前512字节
-                header = f.read(512)
-                
-                if len(header) < 512:
-                    info['type'] = 'Invalid'
-                    return info
-                
+            if info['size'] < 512:
+                info['type'] = 'Invalid'
+                return info
+            
+            # 把前512字节映射进内存，签名比较直接在页缓存上进行
+            with open(image_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 512, access=mmap.ACCESS_READ) as header:
                 # 检查MBR签名
                 if header[510:512] == b'\x55\xaa':
                     info['type'] = 'MBR Disk'
                     info['partitions'] = self._parse_mbr_partitions(header)
                 
                 # 检查文件系统签名
-                elif header[3:11] == b'NTFS    ':
-                    info['type'] = 'NTFS Partition'
-                elif b'FAT32' in header[82:90]:
-                    info['type'] = 'FAT32 Partition'
-                elif header[54:59] == b'FAT16':
-                    info['type'] = 'FAT16 Partition'
                 else:
                     info['type'] = 'Raw Data'
+                    for start, end, signature, fs_type in _FS_SIGNATURES:
+                        if header.find(signature, start, end) != -1:
+                            info['type'] = fs_type
+                            break
         
         except Exception as e:
             info['type'] = f'Error: {str(e)}'
@@ -139,20 +422,16 @@ class VirtualDisk(QObject):
         """解析MBR分区表"""
         partitions = []
         
+        if len(mbr_data) < 446 + _MBR_TABLE.size:
+            return partitions
+        
+        fields = _MBR_TABLE.unpack_from(mbr_data, 446)
         for i in range(4):
-            offset = 446 + i * 16
-            partition_entry = mbr_data[offset:offset + 16]
-            
-            if len(partition_entry) < 16:
-                continue
-            
-            partition_type = partition_entry[4]
+            _, _, partition_type, _, start_lba, size_sectors = \
+                fields[i * _MBR_ENTRY_FIELDS:(i + 1) * _MBR_ENTRY_FIELDS]
             if partition_type == 0:
                 continue
             
-            start_lba = struct.unpack('<L', partition_entry[8:12])[0]
-            size_sectors = struct.unpack('<L', partition_entry[12:16])[0]
-            
             partition_info = {
                 'index': i + 1,
                 'type': self._get_partition_type_name(partition_type),
@@ -166,24 +445,10 @@ class VirtualDisk(QObject):
         
         return partitions
     
-    def _get_partition_type_name(self, type_code):
+    @staticmethod
+    def _get_partition_type_name(type_code):
         """获取分区类型名称"""
-        partition_types = {
-            0x01: 'FAT12',
-            0x04: 'FAT16 (< 32MB)',
-            0x06: 'FAT16',
-            0x07: 'NTFS/HPFS',
-            0x0B: 'FAT32',
-            0x0C: 'FAT32 (LBA)',
-            0x0E: 'FAT16 (LBA)',
-            0x0F: 'Extended (LBA)',
-            0x82: 'Linux Swap',
-            0x83: 'Linux',
-            0x8E: 'Linux LVM',
-            0xEE: 'GPT Protective'
-        }
-        
-        return partition_types.get(type_code, f'Unknown (0x{type_code:02X})')
+        return _PARTITION_TYPES.get(type_code) or f'Unknown (0x{type_code:02X})'
     
     def _create_fat32_partition(self, file_obj, size_bytes):
         """创建FAT32分区"""
@@ -196,108 +461,93 @@ class VirtualDisk(QObject):
         total_sectors = size_bytes // bytes_per_sector
         sectors_per_fat = max(1, (total_sectors - reserved_sectors) // (sectors_per_cluster * 65536 + num_fats))
         
-        # 创建引导扇区
-        boot_sector = bytearray(512)
-        
-        # 跳转指令
-        boot_sector[0:3] = b'\xEB\x58\x90'
-        
-        # OEM标识
-        boot_sector[3:11] = b'MSWIN4.1'
-        
-        # BPB (BIOS Parameter Block)
-        struct.pack_into('<H', boot_sector, 11, bytes_per_sector)  # 每扇区字节数
-        boot_sector[13] = sectors_per_cluster  # 每簇扇区数
-        struct.pack_into('<H', boot_sector, 14, reserved_sectors)  # 保留扇区数
-        boot_sector[16] = num_fats  # FAT表数量
-        struct.pack_into('<H', boot_sector, 17, 0)  # 根目录项数 (FAT32为0)
-        struct.pack_into('<H', boot_sector, 19, 0)  # 总扇区数 (小于65536时使用)
-        boot_sector[21] = 0xF8  # 媒体描述符
-        struct.pack_into('<H', boot_sector, 22, 0)  # 每FAT扇区数 (FAT32为0)
-        struct.pack_into('<H', boot_sector, 24, 63)  # 每磁道扇区数
-        struct.pack_into('<H', boot_sector, 26, 255)  # 磁头数
-        struct.pack_into('<L', boot_sector, 28, 0)  # 隐藏扇区数
-        struct.pack_into('<L', boot_sector, 32, total_sectors)  # 总扇区数
-        
-        # FAT32扩展BPB
-        struct.pack_into('<L', boot_sector, 36, sectors_per_fat)  # 每FAT扇区数
-        struct.pack_into('<H', boot_sector, 40, 0)  # 扩展标志
-        struct.pack_into('<H', boot_sector, 42, 0)  # 文件系统版本
-        struct.pack_into('<L', boot_sector, 44, 2)  # 根目录簇号
-        struct.pack_into('<H', boot_sector, 48, 1)  # 文件系统信息扇区
-        struct.pack_into('<H', boot_sector, 50, 6)  # 备份引导扇区
+        # 保留扇区和各FAT表在一个缓冲区中构建，一次写入
+        fat_size = sectors_per_fat * bytes_per_sector
+        fat_offset = reserved_sectors * bytes_per_sector
+        header = bytearray(fat_offset + num_fats * fat_size)
         
-        # 驱动器号和签名
-        boot_sector[64] = 0x80  # 驱动器号
-        boot_sector[66] = 0x29  # 扩展引导签名
-        struct.pack_into('<L', boot_sector, 67, 0x12345678)  # 卷序列号
-        boot_sector[71:82] = b'NO NAME    '  # 卷标
-        boot_sector[82:90] = b'FAT32   '  # 文件系统类型
+        # 引导扇区
+        _FAT32_BOOT.pack_into(
+            header, 0,
+            b'\xEB\x58\x90',  # 跳转指令
+            b'MSWIN4.1',  # OEM标识
+            # BPB (BIOS Parameter Block)
+            bytes_per_sector,  # 每扇区字节数
+            sectors_per_cluster,  # 每簇扇区数
+            reserved_sectors,  # 保留扇区数
+            num_fats,  # FAT表数量
+            0,  # 根目录项数 (FAT32为0)
+            0,  # 总扇区数 (小于65536时使用)
+            0xF8,  # 媒体描述符
+            0,  # 每FAT扇区数 (FAT32为0)
+            63,  # 每磁道扇区数
+            255,  # 磁头数
+            0,  # 隐藏扇区数
+            total_sectors,  # 总扇区数
+            # FAT32扩展BPB
+            sectors_per_fat,  # 每FAT扇区数
+            0,  # 扩展标志
+            0,  # 文件系统版本
+            2,  # 根目录簇号
+            1,  # 文件系统信息扇区
+            6,  # 备份引导扇区
+            # 驱动器号和签名
+            0x80,  # 驱动器号
+            0,  # 保留
+            0x29,  # 扩展引导签名
+            0x12345678,  # 卷序列号
+            b'NO NAME    ',  # 卷标
+            b'FAT32   '  # 文件系统类型
+        )
         
         # 引导签名
-        boot_sector[510:512] = b'\x55\xAA'
+        header[510:512] = b'\x55\xAA'
         
-        # 写入引导扇区
-        file_obj.write(boot_sector)
-        
-        # 写入剩余的保留扇区
-        for i in range(1, reserved_sectors):
-            file_obj.write(b'\x00' * bytes_per_sector)
+        # FAT表开头：媒体描述符和EOC，根目录簇链结束
+        for fat_start in range(fat_offset, len(header), fat_size):
+            header[fat_start:fat_start + 8] = b'\xF8\xFF\xFF\x0F\xFF\xFF\xFF\xFF'
         
-        # 写入FAT表
-        fat_data = bytearray(sectors_per_fat * bytes_per_sector)
-        fat_data[0:4] = b'\xF8\xFF\xFF\x0F'  # 媒体描述符和EOC
-        fat_data[4:8] = b'\xFF\xFF\xFF\xFF'  # 根目录簇链结束
+        file_obj.write(header)
         
-        for i in range(num_fats):
-            file_obj.write(fat_data)
-        
-        # 写入数据区
-        data_sectors = total_sectors - reserved_sectors - num_fats * sectors_per_fat
-        for i in range(data_sectors):
-            file_obj.write(b'\x00' * bytes_per_sector)
+        # 数据区全为零，直接扩展文件
+        self._extend_to(file_obj, total_sectors * bytes_per_sector)
     
     def _create_ntfs_partition(self, file_obj, size_bytes):
         """创建NTFS分区"""
-        # 计算参数
         bytes_per_sector = 512
-        sectors_per_cluster = 8
         total_sectors = size_bytes // bytes_per_sector
         
-        # 创建引导扇区
-        boot_sector = bytearray(512)
-        
-        # 跳转指令
-        boot_sector[0:3] = b'\xEB\x52\x90'
-        
-        # OEM标识
-        boot_sector[3:11] = b'NTFS    '
-        
-        # BPB
-        struct.pack_into('<H', boot_sector, 11, bytes_per_sector)  # 每扇区字节数
-        boot_sector[13] = sectors_per_cluster  # 每簇扇区数
-        struct.pack_into('<H', boot_sector, 14, 0)  # 保留扇区数
-        boot_sector[16] = 0  # FAT表数量
-        struct.pack_into('<H', boot_sector, 17, 0)  # 根目录项数
-        struct.pack_into('<H', boot_sector, 19, 0)  # 总扇区数 (小值)
-        boot_sector[21] = 0xF8  # 媒体描述符
-        struct.pack_into('<H', boot_sector, 22, 0)  # 每FAT扇区数
-        struct.pack_into('<H', boot_sector, 24, 63)  # 每磁道扇区数
-        struct.pack_into('<H', boot_sector, 26, 255)  # 磁头数
-        struct.pack_into('<L', boot_sector, 28, 0)  # 隐藏扇区数
-        struct.pack_into('<L', boot_sector, 32, 0)  # 总扇区数 (大值)
-        
-        # NTFS扩展BPB
-        struct.pack_into('<Q', boot_sector, 40, total_sectors)  # 总扇区数
-        struct.pack_into('<Q', boot_sector, 48, total_sectors // 2)  # MFT簇号
-        struct.pack_into('<Q', boot_sector, 56, total_sectors // 4)  # MFT镜像簇号
-        
-        # 引导签名
-        boot_sector[510:512] = b'\x55\xAA'
+        # 引导扇区由模板复制，只填入随分区大小变化的字段
+        boot_sector = bytearray(_NTFS_BOOT_TEMPLATE)
+        _NTFS_SIZES.pack_into(
+            boot_sector, _NTFS_SIZE_OFFSET,
+            total_sectors,  # 总扇区数
+            total_sectors // 2,  # MFT簇号
+            total_sectors // 4  # MFT镜像簇号
+        )
         
         # 写入引导扇区
         file_obj.write(boot_sector)
         
-        # 写入剩余扇区
-        for i in range(1, total_sectors):
-            file_obj.write(b'\x00' * bytes_per_sector)
\ No newline at end of file
+        # 剩余扇区全为零，直接扩展文件
+        self._extend_to(file_obj, total_sectors * bytes_per_sector)
+
+class DiskImageWorker(QThread):
+    """磁盘镜像创建工作线程"""
+    
+    image_created = pyqtSignal(str)
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, virtual_disk, source_disk, output_path, image_type='raw', parent=None):
+        super().__init__(parent)
+        self.virtual_disk = virtual_disk
+        self.source_disk = source_disk
+        self.output_path = output_path
+        self.image_type = image_type
+    
+    def run(self):
+        try:
+            output_path = self.virtual_disk.create_disk_image(self.source_disk, self.output_path, self.image_type)
+            self.image_created.emit(output_path)
+        except Exception as e:
+            self.error_occurred.emit(str(e))
\ No newline at end of file